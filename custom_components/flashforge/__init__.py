@@ -12,11 +12,15 @@ from homeassistant.core import (
     ServiceCall,
     ServiceResponse,
     SupportsResponse,
+    callback,
 )
 from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 
 from .const import DOMAIN
 from .data_update_coordinator import FlashForgeDataUpdateCoordinator
+from .discovery import async_get_scanner
+from .mjpeg import MjpegStreamHub
+from .timelapse import TimelapseRecorder
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -41,58 +45,81 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:  #
         await coordinator.async_config_entry_first_refresh()
     except (TimeoutError, ConnectionError) as err:
         _LOGGER.debug("Printer not responding: %s", err)
+        # The printer may have got a new address, the scanner updates the
+        # entry if it finds the printer somewhere else.
+        async_get_scanner(hass).async_request_scan()
         raise ConfigEntryNotReady(err) from err
+    entry.async_on_unload(coordinator.farm.async_register(coordinator))
+    # Scan on an interval while at least one printer is loaded.
+    async_get_scanner(hass).async_start()
+    connection = coordinator.connection
+    connection.async_start()
+    entry.async_on_unload(connection.async_close)
+    # The camera entity and the timelapse share one camera connection.
+    hub = MjpegStreamHub(hass, await printer.network.getCameraStream())
+    coordinator.stream_hub = hub
+    entry.async_on_unload(hub.async_stop)
+    timelapse = TimelapseRecorder(hass, coordinator, hub)
+    timelapse.async_start()
+    entry.async_on_unload(timelapse.async_stop)
+    # The file list is not needed to get the entry running, a failed
+    # refresh only leaves the file list unavailable until next poll.
+    file_list_coordinator = coordinator.file_list_coordinator
+    await file_list_coordinator.async_refresh()
     # Save the coordinator object to be able to access it later on.
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
     async def pause(_: ServiceCall) -> None:
         """Handle the service call."""
         _LOGGER.debug("Pause")
-        await printer.connect()
-        pr = await printer.network.sendPauseRequest()
+        pr = await connection.async_request(printer.network.sendPauseRequest)
         _LOGGER.debug("pauseRequest: %s", pr)
 
     async def continue_print(_: ServiceCall) -> None:
         """Handle the service call."""
         _LOGGER.debug("Continue")
-        await printer.connect()
-        pr = await printer.network.sendContinueRequest()
+        pr = await connection.async_request(printer.network.sendContinueRequest)
         _LOGGER.debug("ContinueRequest: %s", pr)
 
     async def abort(_: ServiceCall) -> None:
         """Handle the service call."""
         _LOGGER.debug("Abort")
-        await printer.connect()
-        pr = await printer.network.sendAbortRequest()
+        pr = await connection.async_request(printer.network.sendAbortRequest)
         _LOGGER.debug("AbortRequest: %s", pr)
 
     async def get_file_names(_: ServiceCall) -> ServiceResponse:
         """Handle the service call."""
         _LOGGER.debug("Get file names")
-        await printer.connect()
-        files_list = await printer.network.sendGetFileNames()
-        _LOGGER.debug("FileNames: %s", files_list)
-        if not files_list:
-            return {"files": []}
-
-        files_list = [f.removeprefix("/data/") for f in files_list]
-        return {"files": files_list}
+        await file_list_coordinator.async_refresh()
+        if not file_list_coordinator.last_update_success:
+            msg = "unable to get file names from printer"
+            raise HomeAssistantError(msg) from file_list_coordinator.last_exception
+        _LOGGER.debug("FileNames: %s", file_list_coordinator.data)
+        return {"files": file_list_coordinator.data or []}
+
+    async def refresh_file_list(_: ServiceCall) -> None:
+        """Handle the service call."""
+        _LOGGER.debug("Refresh file list")
+        await file_list_coordinator.async_request_refresh()
 
     async def print_file(call: ServiceCall) -> None:
         """Handle the service call."""
         _LOGGER.debug("print_file")
         filename = call.data.get("file_name")
-        await printer.connect()
-        if printer.machine_status != "READY":
+        if coordinator.data.machine_status != "READY":
             msg = "printer status is not READY"
             raise HomeAssistantError(msg)
-        pr = await printer.network.sendPrintRequest(file=filename)
+        pr = await connection.async_request(
+            printer.network.sendPrintRequest, file=filename
+        )
         _LOGGER.debug("print_file: %s", pr)
+        await file_list_coordinator.async_request_refresh()
 
     hass.services.async_register(DOMAIN, "pause", pause)
     hass.services.async_register(DOMAIN, "continue_print", continue_print)
     hass.services.async_register(DOMAIN, "abort", abort)
     hass.services.async_register(DOMAIN, "print_file", print_file)
+    hass.services.async_register(DOMAIN, "refresh_file_list", refresh_file_list)
     hass.services.async_register(
         DOMAIN,
         "get_file_names",
@@ -101,14 +128,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:  #
     )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     await coordinator.async_request_refresh()
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload config entry when options are changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        _async_stop_scanner_if_unused(hass, entry)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Stop the scanner when an entry that never loaded is removed."""
+    _async_stop_scanner_if_unused(hass, entry)
+
+
+@callback
+def _async_stop_scanner_if_unused(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Stop the discovery scanner if no other printer is loaded."""
+    if not any(
+        other.entry_id != entry.entry_id
+        for other in hass.config_entries.async_loaded_entries(DOMAIN)
+    ):
+        async_get_scanner(hass).async_stop()
@@ -93,7 +93,7 @@ class PrinterButton(ButtonEntity):
 
     async def async_press(self) -> None:
         """Send out a persistent notification."""
-        result = await self._action()
+        result = await self.coordinator.connection.async_request(self._action)
         _LOGGER.debug("Flashforge printer responded with: %s", result)
 
     @property
@@ -117,5 +117,8 @@ class FilePrinterButton(PrinterButton):
             return
         select_state = self.coordinator.hass.states.get(select_entity)
         state = select_state.state if select_state else None
-        result = await self._action(file=state)
+        result = await self.coordinator.connection.async_request(
+            self._action, file=state
+        )
         _LOGGER.debug("Flashforge printer responded with: %s", result)
+        await self.coordinator.file_list_coordinator.async_request_refresh()
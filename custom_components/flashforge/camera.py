@@ -3,46 +3,39 @@
 from __future__ import annotations
 
 import logging
-from contextlib import closing
 from typing import TYPE_CHECKING
 
-import requests
+from aiohttp import web
 from homeassistant.components.camera import Camera
-from homeassistant.helpers.aiohttp_client import (
-    async_aiohttp_proxy_web,
-    async_get_clientsession,
-)
 
-from .const import DOMAIN
+from .const import (
+    CONF_SNAPSHOT_MAX_AGE,
+    DEFAULT_SNAPSHOT_MAX_AGE,
+    DOMAIN,
+    MJPEG_BOUNDARY,
+)
+from .mjpeg import MjpegFrameParser, ScaledFrameCache
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .data_update_coordinator import FlashForgeDataUpdateCoordinator
+    from .mjpeg import MjpegStreamHub
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def extract_image_from_mjpeg(stream):
+def extract_image_from_mjpeg(stream: Iterable[bytes]) -> bytes | None:
     """Take in a MJPEG stream object, return the jpg from it."""
-    data = b""
-
+    parser = MjpegFrameParser()
     for chunk in stream:
-        data += chunk
-        jpg_end = data.find(b"\xff\xd9")
-
-        if jpg_end == -1:
-            continue
-
-        jpg_start = data.find(b"\xff\xd8")
-
-        if jpg_start == -1:
-            continue
-
-        return data[jpg_start : jpg_end + 2]
-    return data
+        if frames := parser.feed(chunk):
+            return frames[0]
+    return None
 
 
 async def async_setup_entry(
@@ -54,19 +47,23 @@ async def async_setup_entry(
     coordinator: FlashForgeDataUpdateCoordinator = hass.data[DOMAIN][
         config_entry.entry_id
     ]
-    mjpeg_url = await coordinator.printer.network.getCameraStream()
-    async_add_entities([FlashForgeCamera(coordinator, mjpeg_url)])
+    async_add_entities([FlashForgeCamera(coordinator, coordinator.stream_hub)])
 
 
 class FlashForgeCamera(Camera):
     """FlashForge camera object."""
 
     def __init__(
-        self, coordinator: FlashForgeDataUpdateCoordinator, mjpeg_url: str
+        self, coordinator: FlashForgeDataUpdateCoordinator, hub: MjpegStreamHub
     ) -> None:
         """Initialize."""
         super().__init__()
-        self._mjpeg_url = mjpeg_url
+        self._mjpeg_url = hub.url
+        self._hub = hub
+        self._scaled_frames = ScaledFrameCache(coordinator.hass)
+        self._snapshot_max_age = coordinator.config_entry.options.get(
+            CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE
+        )
         self.coordinator = coordinator
 
         self._device_id = coordinator.config_entry.unique_id
@@ -75,8 +72,10 @@ class FlashForgeCamera(Camera):
         self._attr_unique_id = f"{coordinator.config_entry.unique_id}_camera"
         self._attr_is_streaming = True
 
-    def camera_image(
-        self, width: int | None = None, height: int | None = None
+    async def async_camera_image(
+        self,
+        width: int | None = None,
+        height: int | None = None,
     ) -> bytes | None:
         """Return a still image response from the camera."""
         if not self.available:
@@ -87,16 +86,17 @@ class FlashForgeCamera(Camera):
             )
             return None
 
-        try:
-            req = requests.get(self._mjpeg_url, stream=True, timeout=10)
+        frame = await self._hub.async_get_frame(self._snapshot_max_age)
+        if frame is None or width is None or height is None:
+            return frame
 
-            with closing(req) as response:
-                return extract_image_from_mjpeg(response.iter_content(102400))
-        except requests.exceptions.ConnectionError:
-            self._attr_is_streaming = False
-            return None
+        # Only the latest frame has a known sequence number to cache it by.
+        seq = self._hub.frame_seq if frame is self._hub.latest_frame else None
+        return await self._scaled_frames.async_scale(seq, frame, width, height)
 
-    async def handle_async_mjpeg_stream(self, request):
+    async def handle_async_mjpeg_stream(
+        self, request: web.Request
+    ) -> web.StreamResponse | None:
         """Generate an HTTP MJPEG stream from the camera."""
         if not self.available:
             self._attr_is_streaming = False
@@ -106,11 +106,25 @@ class FlashForgeCamera(Camera):
             )
             return None
 
-        # connect to stream
-        websession = async_get_clientsession(self.hass)
-        stream_coro = websession.get(self._mjpeg_url)
-
-        return await async_aiohttp_proxy_web(self.hass, request, stream_coro)
+        # All viewers share one connection to the camera.
+        response = web.StreamResponse()
+        response.content_type = f"multipart/x-mixed-replace;boundary={MJPEG_BOUNDARY}"
+        await response.prepare(request)
+        async with self._hub.async_subscribe() as frames:
+            while (frame := await frames.get()) is not None:
+                try:
+                    await response.write(
+                        b"--%s\r\nContent-Type: image/jpeg\r\n"
+                        b"Content-Length: %d\r\n\r\n%s\r\n"
+                        % (MJPEG_BOUNDARY.encode(), len(frame), frame)
+                    )
+                except ConnectionResetError:
+                    break
+        return response
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Close the camera connection when entity is removed."""
+        await self._hub.async_stop()
 
     @property
     def available(self) -> bool:
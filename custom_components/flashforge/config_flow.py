@@ -3,16 +3,42 @@
 from typing import Any
 
 import voluptuous as vol
-from ffpp import Discovery
 from ffpp.Printer import Printer
 from homeassistant import config_entries
-from homeassistant.components.network import async_get_source_ip
-from homeassistant.config_entries import ConfigFlowResult
-from homeassistant.const import CONF_IP_ADDRESS, CONF_PORT
+from homeassistant.config_entries import ConfigEntry, ConfigFlowResult
+from homeassistant.const import CONF_IP_ADDRESS, CONF_NAME, CONF_PORT
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import discovery_flow
+from homeassistant.helpers.selector import SelectSelector, SelectSelectorConfig
 
-from .const import CONF_SERIAL_NUMBER, DOMAIN
+from .const import (
+    CONF_ADD,
+    CONF_ATTEMPT_TIMEOUT,
+    CONF_FAILURE_THRESHOLD,
+    CONF_PRINTERS,
+    CONF_PROBE_INTERVAL,
+    CONF_RETRY_ATTEMPTS,
+    CONF_RETRY_BACKOFF,
+    CONF_SERIAL_NUMBER,
+    CONF_SNAPSHOT_MAX_AGE,
+    CONF_TEMP_DEADBAND,
+    CONF_TIMELAPSE_INTERVAL,
+    CONF_TIMELAPSE_MODE,
+    DEFAULT_ATTEMPT_TIMEOUT,
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_PORT,
+    DEFAULT_PROBE_INTERVAL,
+    DEFAULT_RETRY_BACKOFF,
+    DEFAULT_SNAPSHOT_MAX_AGE,
+    DEFAULT_TEMP_DEADBAND,
+    DEFAULT_TIMELAPSE_INTERVAL,
+    DOMAIN,
+    MAX_FAILED_UPDATES,
+    TIMELAPSE_MODE_OFF,
+    TIMELAPSE_MODES,
+)
+from .discovery import DiscoveredPrinter, async_discover_printers
 
 
 class FlashForgeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -22,16 +48,26 @@ class FlashForgeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     ip_addr: str | None
     port: int
-    serial: str
+    serial: str | None
+    title: str
     machine_type: str
     printer: Printer
+    discovered: dict[str, DiscoveredPrinter]
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: ConfigEntry,  # noqa: ARG004
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return FlashForgeOptionsFlow()
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Run when user trying to add component."""
         errors = {}
-        self.port = 8899
+        self.port = DEFAULT_PORT
         self.ip_addr = None
 
         if user_input is not None:
@@ -53,37 +89,85 @@ class FlashForgeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self._async_show_form(errors=errors)
 
     async def async_step_auto(self) -> ConfigFlowResult:
-        """Try to discover ip of printer and return a confirm form."""
-        ip = None
-        port = 8899
-        local_ip = await async_get_source_ip(self.hass)
-        discovered_printers = await Discovery.getPrinters(
-            self.hass.loop,
-            limit=1,
-            host_ip=local_ip,
-        )
-        # Get the first discovered printer ip
-        for _, ip_addr in discovered_printers:
-            ip = ip_addr
-            break
-
-        if ip is None:
+        """Discover printers on the network and offer the ones not configured."""
+        printers = await async_discover_printers(self.hass, self._async_current_ids())
+        if not printers:
             return self.async_abort(reason="no_devices_found")
 
-        try:
-            await self._get_printer_info(
-                self.hass, {CONF_IP_ADDRESS: ip, CONF_PORT: port}
+        if len(printers) == 1:
+            printer = printers[0]
+            await self._async_set_discovered(printer)
+            self._set_confirm_only()
+            return self.async_show_form(
+                step_id="auto_confirm",
+                description_placeholders={
+                    "machine_name": self.title,
+                    "ip_addr": printer.ip_address,
+                },
             )
-        except (TimeoutError, ConnectionError):
-            return self.async_abort(reason="no_devices_found")
+
+        self.discovered = {
+            printer.serial or printer.ip_address: printer for printer in printers
+        }
+        return await self.async_step_pick()
+
+    async def async_step_pick(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Let the user pick which of the discovered printers to add."""
+        errors = {}
+        if user_input is not None:
+            if selected := [
+                self.discovered.pop(key) for key in user_input[CONF_PRINTERS]
+            ]:
+                # The first printer is added by this flow, the other selected
+                # printers by flows of their own. Printers not selected are
+                # offered as discovered printers.
+                for printer in selected[1:]:
+                    self._async_create_discovery_flow(printer, add=True)
+                for printer in self.discovered.values():
+                    self._async_create_discovery_flow(printer, add=False)
+                await self._async_set_discovered(selected[0])
+                return self._async_create_entry()
+            errors["base"] = "no_printers_selected"
+
+        printers = {
+            key: f"{printer.title} ({printer.ip_address})"
+            for key, printer in self.discovered.items()
+        }
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_PRINTERS, default=list(printers)): (
+                        cv.multi_select(printers)
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_integration_discovery(
+        self, discovery_info: dict[str, Any]
+    ) -> ConfigFlowResult:
+        """Handle a printer found by discovery."""
+        printer = DiscoveredPrinter(
+            ip_address=discovery_info[CONF_IP_ADDRESS],
+            port=discovery_info[CONF_PORT],
+            serial=discovery_info[CONF_SERIAL_NUMBER],
+            name=discovery_info.get(CONF_NAME),
+        )
+        await self._async_set_discovered(printer)
+        self.context["title_placeholders"] = {"serial_number": self.title}
+        if discovery_info.get(CONF_ADD):
+            return self._async_create_entry()
 
         self._set_confirm_only()
-        title = self.printer.machine_name or self.printer.serial or ""
         return self.async_show_form(
             step_id="auto_confirm",
             description_placeholders={
-                "machine_name": title,
-                "ip_addr": ip,
+                "machine_name": self.title,
+                "ip_addr": printer.ip_address,
             },
         )
 
@@ -93,6 +177,36 @@ class FlashForgeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """User confirmed to add device to Home Assistant."""
         return self._async_create_entry()
 
+    async def _async_set_discovered(self, printer: DiscoveredPrinter) -> None:
+        """Use a discovered printer for this flow."""
+        self.ip_addr = printer.ip_address
+        self.port = printer.port
+        self.serial = printer.serial
+        self.title = printer.title
+        if printer.serial is not None:
+            await self.async_set_unique_id(printer.serial)
+        self._abort_if_unique_id_configured(
+            updates={CONF_IP_ADDRESS: self.ip_addr, CONF_PORT: self.port}
+        )
+
+    @callback
+    def _async_create_discovery_flow(
+        self, printer: DiscoveredPrinter, *, add: bool
+    ) -> None:
+        """Start a flow for a discovered printer, add it right away if add is set."""
+        discovery_flow.async_create_flow(
+            self.hass,
+            DOMAIN,
+            context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+            data={
+                CONF_IP_ADDRESS: printer.ip_address,
+                CONF_PORT: printer.port,
+                CONF_SERIAL_NUMBER: printer.serial,
+                CONF_NAME: printer.name,
+                CONF_ADD: add,
+            },
+        )
+
     @callback
     def _async_show_form(
         self,
@@ -122,6 +236,8 @@ class FlashForgeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.printer = Printer(self.ip_addr, self.port)
 
         await self.printer.connect()
+        self.serial = self.printer.serial
+        self.title = self.printer.machine_name or self.printer.serial or ""
 
         if self.printer.serial is not None:
             await self.async_set_unique_id(self.printer.serial)
@@ -133,12 +249,76 @@ class FlashForgeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     @callback
     def _async_create_entry(self) -> ConfigFlowResult:
         """Create config entry."""
-        title = self.printer.machine_name or self.printer.serial or ""
         return self.async_create_entry(
-            title=title,
+            title=self.title,
             data={
                 CONF_IP_ADDRESS: self.ip_addr,
                 CONF_PORT: self.port,
-                CONF_SERIAL_NUMBER: self.printer.serial,
+                CONF_SERIAL_NUMBER: self.serial,
             },
         )
+
+
+class FlashForgeOptionsFlow(config_entries.OptionsFlow):
+    """Options flow, used to tune how the printer and camera are polled."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_RETRY_ATTEMPTS,
+                    default=options.get(CONF_RETRY_ATTEMPTS, MAX_FAILED_UPDATES),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                vol.Optional(
+                    CONF_ATTEMPT_TIMEOUT,
+                    default=options.get(CONF_ATTEMPT_TIMEOUT, DEFAULT_ATTEMPT_TIMEOUT),
+                ): vol.All(vol.Coerce(float), vol.Range(min=1, max=60)),
+                vol.Optional(
+                    CONF_RETRY_BACKOFF,
+                    default=options.get(CONF_RETRY_BACKOFF, DEFAULT_RETRY_BACKOFF),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=30)),
+                vol.Optional(
+                    CONF_FAILURE_THRESHOLD,
+                    default=options.get(
+                        CONF_FAILURE_THRESHOLD, DEFAULT_FAILURE_THRESHOLD
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+                vol.Optional(
+                    CONF_PROBE_INTERVAL,
+                    default=options.get(CONF_PROBE_INTERVAL, DEFAULT_PROBE_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+                vol.Optional(
+                    CONF_SNAPSHOT_MAX_AGE,
+                    default=options.get(
+                        CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=300)),
+                vol.Optional(
+                    CONF_TEMP_DEADBAND,
+                    default=options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+                vol.Optional(
+                    CONF_TIMELAPSE_MODE,
+                    default=options.get(CONF_TIMELAPSE_MODE, TIMELAPSE_MODE_OFF),
+                ): SelectSelector(
+                    SelectSelectorConfig(
+                        options=TIMELAPSE_MODES, translation_key=CONF_TIMELAPSE_MODE
+                    )
+                ),
+                vol.Optional(
+                    CONF_TIMELAPSE_INTERVAL,
+                    default=options.get(
+                        CONF_TIMELAPSE_INTERVAL, DEFAULT_TIMELAPSE_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+            }
+        )
+
+        return self.async_show_form(step_id="init", data_schema=data_schema)
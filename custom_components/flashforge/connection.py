@@ -0,0 +1,298 @@
+"""Shared TCP session to the control port of a FlashForge printer."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DEFAULT_ATTEMPT_TIMEOUT, KEEPALIVE_INTERVAL
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+    from datetime import datetime
+
+    from ffpp.Printer import Printer
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lower value is sent first.
+PRIORITY_ACTION = 0
+PRIORITY_POLL = 1
+PRIORITY_KEEPALIVE = 2
+
+
+@dataclass
+class CommandStats:
+    """Latency and error counters for one kind of command."""
+
+    count: int = 0
+    errors: int = 0
+    coalesced: int = 0
+    last: float | None = None
+    max: float = 0.0
+    total: float = 0.0
+    wait_total: float = 0.0
+
+    def record(self, latency: float, wait: float, *, error: bool) -> None:
+        """Record one sent command."""
+        self.count += 1
+        self.errors += error
+        self.last = latency
+        self.max = max(self.max, latency)
+        self.total += latency
+        self.wait_total += wait
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return stats for diagnostics, times in milliseconds."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "coalesced": self.coalesced,
+            "last_ms": round(self.last * 1000, 1) if self.last is not None else None,
+            "avg_ms": round(self.total / self.count * 1000, 1) if self.count else None,
+            "max_ms": round(self.max * 1000, 1),
+            "avg_wait_ms": (
+                round(self.wait_total / self.count * 1000, 1) if self.count else None
+            ),
+        }
+
+
+@dataclass(order=True)
+class _Command:
+    """A queued command, ordered by priority and then by arrival."""
+
+    priority: int
+    seq: int
+    name: str = field(compare=False)
+    func: Callable[..., Awaitable[Any]] = field(compare=False)
+    args: tuple[Any, ...] = field(compare=False)
+    kwargs: dict[str, Any] = field(compare=False)
+    close: bool = field(compare=False)
+    reconnect: bool = field(compare=False)
+    timeout: float = field(compare=False)
+    key: Hashable | None = field(compare=False)
+    future: asyncio.Future[Any] = field(compare=False)
+    queued_at: float = field(compare=False, default_factory=time.monotonic)
+
+
+def _command_name(func: Callable[..., Any]) -> str:
+    """Return a name for a printer command, used for stats."""
+    return getattr(func, "__name__", None) or repr(func)
+
+
+def _consume_exception(future: asyncio.Future[Any]) -> None:
+    """Mark the exception of a future as retrieved if nobody is waiting for it."""
+    if not future.cancelled():
+        future.exception()
+
+
+class PrinterConnection:
+    """Keep one long lived session to the printer and serialize all commands."""
+
+    # The printer only handles one client at a time on its control port and
+    # mixes up replies to concurrent requests. The coordinator, services and
+    # entities therefore queue their commands here and a single worker sends
+    # them one at a time, user actions ahead of polling.
+
+    def __init__(self, hass: HomeAssistant, printer: Printer) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.printer = printer
+        self.stats: dict[str, CommandStats] = {}
+        self._queue: asyncio.PriorityQueue[_Command] = asyncio.PriorityQueue()
+        self._inflight: dict[Hashable, asyncio.Future[Any]] = {}
+        self._seq = itertools.count()
+        self._worker: asyncio.Task[None] | None = None
+        self._connected = False
+        self._last_used = 0.0
+        self._unsub_keepalive: CALLBACK_TYPE | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the session is open."""
+        return self._connected
+
+    @property
+    def queue_size(self) -> int:
+        """Return number of commands waiting to be sent."""
+        return self._queue.qsize()
+
+    @callback
+    def async_start(self) -> None:
+        """Start sending keepalives on an idle session."""
+        self._unsub_keepalive = async_track_time_interval(
+            self.hass,
+            self._async_keepalive,
+            timedelta(seconds=KEEPALIVE_INTERVAL),
+            name="FlashForge keepalive",
+        )
+
+    async def async_close(self) -> None:
+        """Stop the worker, fail queued commands and close the session."""
+        if self._unsub_keepalive is not None:
+            self._unsub_keepalive()
+            self._unsub_keepalive = None
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        while not self._queue.empty():
+            command = self._queue.get_nowait()
+            if not command.future.done():
+                command.future.set_exception(ConnectionError("connection closed"))
+        self._inflight.clear()
+        await self._async_disconnect()
+
+    async def async_request(  # noqa: PLR0913
+        self,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        priority: int = PRIORITY_ACTION,
+        coalesce: bool = False,
+        close: bool = False,
+        reconnect: bool = True,
+        command_timeout: float = DEFAULT_ATTEMPT_TIMEOUT,
+        **kwargs: Any,
+    ) -> Any:
+        """Queue a command and wait for the reply."""
+        # coalesce: share the reply with an identical read that is already
+        # queued or being sent, instead of asking the printer twice.
+        # close: drop the session afterwards, used for commands with replies
+        # too large for the single read ffpp does, so no unread bytes are
+        # left to be mistaken for the reply of the next command.
+        # reconnect: retry once on a fresh session if a reused session failed,
+        # the printer drops sessions it considers idle.
+        # command_timeout: time the command may hold the session once sent.
+        name = _command_name(func)
+        key = (func, args, tuple(sorted(kwargs.items()))) if coalesce else None
+        if key is not None and (future := self._inflight.get(key)) is not None:
+            self.stats.setdefault(name, CommandStats()).coalesced += 1
+            return await asyncio.shield(future)
+
+        future = self.hass.loop.create_future()
+        future.add_done_callback(_consume_exception)
+        if key is not None:
+            self._inflight[key] = future
+        self._queue.put_nowait(
+            _Command(
+                priority=priority,
+                seq=next(self._seq),
+                name=name,
+                func=func,
+                args=args,
+                kwargs=kwargs,
+                close=close,
+                reconnect=reconnect,
+                timeout=command_timeout,
+                key=key,
+                future=future,
+            )
+        )
+        if self._worker is None:
+            self._worker = self.hass.async_create_background_task(
+                self._async_worker(), name="FlashForge command worker"
+            )
+        # Shield the shared future so one waiter giving up doesn't fail others.
+        return await asyncio.shield(future)
+
+    async def _async_worker(self) -> None:
+        """Send queued commands one at a time."""
+        while True:
+            command = await self._queue.get()
+            wait = time.monotonic() - command.queued_at
+            start = time.monotonic()
+            try:
+                async with asyncio.timeout(command.timeout):
+                    result = await self._async_execute(command)
+            except asyncio.CancelledError:
+                if not command.future.done():
+                    command.future.set_exception(ConnectionError("connection closed"))
+                raise
+            except (TimeoutError, ConnectionError) as err:
+                self._record(command, start, wait, error=True)
+                if not command.future.done():
+                    command.future.set_exception(err)
+            except Exception as err:
+                _LOGGER.exception("Unexpected error sending %s", command.name)
+                self._record(command, start, wait, error=True)
+                if not command.future.done():
+                    command.future.set_exception(err)
+            else:
+                self._record(command, start, wait, error=False)
+                if not command.future.done():
+                    command.future.set_result(result)
+            finally:
+                if command.key is not None:
+                    self._inflight.pop(command.key, None)
+
+    def _record(
+        self, command: _Command, start: float, wait: float, *, error: bool
+    ) -> None:
+        """Record latency of a sent command."""
+        self.stats.setdefault(command.name, CommandStats()).record(
+            time.monotonic() - start, wait, error=error
+        )
+
+    async def _async_execute(self, command: _Command) -> Any:
+        """Send a command, reconnecting once if the reused session was lost."""
+        reused = self._connected
+        try:
+            return await self._async_send(command)
+        except (TimeoutError, ConnectionError) as err:
+            if not (command.reconnect and reused):
+                raise
+            _LOGGER.debug("Session to printer lost, reconnecting: %s", err)
+            return await self._async_send(command)
+
+    async def _async_send(self, command: _Command) -> Any:
+        """Send one command and keep track of the session state."""
+        try:
+            result = await command.func(
+                *command.args, disconnect=command.close, **command.kwargs
+            )
+        except (TimeoutError, ConnectionError, asyncio.CancelledError):
+            # A half read reply would be read as the answer to next command.
+            await self._async_disconnect()
+            raise
+        self._connected = not command.close
+        self._last_used = time.monotonic()
+        return result
+
+    async def _async_disconnect(self) -> None:
+        """Close the session."""
+        self._connected = False
+        await self.printer.network.disconnect()
+
+    async def _async_keepalive(self, _: datetime) -> None:
+        """Keep an idle session open by asking for the print progress."""
+        if (
+            not self._connected
+            or not self._queue.empty()
+            or time.monotonic() - self._last_used < KEEPALIVE_INTERVAL
+        ):
+            return
+        try:
+            await self.async_request(
+                self.printer.network.sendProgressRequest,
+                priority=PRIORITY_KEEPALIVE,
+                coalesce=True,
+                reconnect=False,
+            )
+        except (TimeoutError, ConnectionError) as err:
+            _LOGGER.debug("Keepalive to printer failed: %s", err)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return session state and command stats for diagnostics."""
+        return {
+            "connected": self._connected,
+            "queue_size": self.queue_size,
+            "commands": {name: s.as_dict() for name, s in self.stats.items()},
+        }
@@ -3,7 +3,74 @@
 DOMAIN = "flashforge"
 DEFAULT_NAME = "FlashForge"
 
+DEFAULT_PORT = 8899
+
 CONF_SERIAL_NUMBER = "serial_number"
+CONF_PRINTERS = "printers"
+CONF_ADD = "add"
+CONF_RETRY_ATTEMPTS = "retry_attempts"
+CONF_ATTEMPT_TIMEOUT = "attempt_timeout"
+CONF_RETRY_BACKOFF = "retry_backoff"
+CONF_FAILURE_THRESHOLD = "failure_threshold"
+CONF_PROBE_INTERVAL = "probe_interval"
+CONF_SNAPSHOT_MAX_AGE = "snapshot_max_age"
+CONF_TEMP_DEADBAND = "temp_deadband"
 
 SCAN_INTERVAL = 30
+# Adaptive polling, see scheduler.py.
+SCAN_INTERVAL_ACTIVE = 5
+SCAN_INTERVAL_IDLE = 120
+SCAN_INTERVAL_OFFLINE_MAX = 600
+IDLE_TIMEOUT = 600
+TEMP_SETTLED_DELTA = 2.0
+ACTIVE_MACHINE_STATUSES = ("BUILDING_FROM_SD",)
+# Temperature changes within the deadband are not written to the state machine.
+DEFAULT_TEMP_DEADBAND = 0.5
+
+# Printer farm, see farm.py.
+DATA_FARM = f"{DOMAIN}_farm"
+SIGNAL_FARM_HOST = f"{DOMAIN}_farm_host"
+SIGNAL_FARM_UPDATED = f"{DOMAIN}_farm_updated"
+FARM_MAX_CONCURRENT_POLLS = 4
+FARM_POLL_SPACING = 0.5
+
+# Discovery, see discovery.py.
+DISCOVERY_MAX_CONCURRENT_QUERIES = 4
+DISCOVERY_QUERY_TIMEOUT = 10
+DISCOVERY_SCAN_INTERVAL = 900
+DISCOVERY_SCAN_COOLDOWN = 60
+DATA_DISCOVERY = f"{DOMAIN}_discovery"
+DATA_DISCOVERY_LOCK = f"{DOMAIN}_discovery_lock"
+
+FILE_LIST_SCAN_INTERVAL = 600
+KEEPALIVE_INTERVAL = 60
+
 MAX_FAILED_UPDATES = 3
+# Retry policy and circuit breaker, see retry.py.
+DEFAULT_ATTEMPT_TIMEOUT = 10.0
+DEFAULT_RETRY_BACKOFF = 0.5
+MAX_RETRY_BACKOFF = 5.0
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_PROBE_INTERVAL = 300
+
+# Camera, see mjpeg.py.
+MJPEG_BOUNDARY = "frame"
+MJPEG_CHUNK_SIZE = 65536
+MJPEG_CONNECT_TIMEOUT = 10
+VIEWER_QUEUE_SIZE = 2
+DEFAULT_SNAPSHOT_MAX_AGE = 5.0
+SNAPSHOT_TIMEOUT = 10
+SCALED_FRAME_CACHE_SIZE = 8
+
+# Timelapse, see timelapse.py.
+CONF_TIMELAPSE_MODE = "timelapse_mode"
+CONF_TIMELAPSE_INTERVAL = "timelapse_interval"
+TIMELAPSE_MODE_OFF = "off"
+TIMELAPSE_MODE_LAYER = "layer"
+TIMELAPSE_MODE_INTERVAL = "interval"
+TIMELAPSE_MODES = [TIMELAPSE_MODE_OFF, TIMELAPSE_MODE_LAYER, TIMELAPSE_MODE_INTERVAL]
+DEFAULT_TIMELAPSE_INTERVAL = 30
+TIMELAPSE_FRAME_MAX_AGE = 1.0
+TIMELAPSE_FPS = 25
+TIMELAPSE_FFMPEG_TIMEOUT = 3600
+EVENT_TIMELAPSE_FINISHED = f"{DOMAIN}_timelapse_finished"
@@ -2,6 +2,7 @@
 
 import logging
 from datetime import timedelta
+from functools import partial
 
 from ffpp.Printer import ConnectionStatus, Printer
 from homeassistant.config_entries import ConfigEntry
@@ -9,15 +10,27 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DEFAULT_NAME, DOMAIN, MAX_FAILED_UPDATES, SCAN_INTERVAL
+from .connection import PRIORITY_POLL, PrinterConnection
+from .const import (
+    DEFAULT_NAME,
+    DOMAIN,
+    FILE_LIST_SCAN_INTERVAL,
+    SCAN_INTERVAL,
+)
+from .farm import async_get_farm
+from .mjpeg import MjpegStreamHub
+from .retry import CircuitBreaker, RetryPolicy
+from .scheduler import AdaptivePollingScheduler
+from .snapshot import PrinterSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class FlashForgeDataUpdateCoordinator(DataUpdateCoordinator):
+class FlashForgeDataUpdateCoordinator(DataUpdateCoordinator[PrinterSnapshot]):
     """Class to manage fetching FlashForgeprinter data."""
 
     config_entry: ConfigEntry
+    stream_hub: MjpegStreamHub
 
     def __init__(
         self, hass: HomeAssistant, printer: Printer, config_entry: ConfigEntry
@@ -32,30 +45,52 @@ class FlashForgeDataUpdateCoordinator(DataUpdateCoordinator):
         )
         self.config_entry = config_entry
         self.printer = printer
+        self.connection = PrinterConnection(hass, printer)
         self._printer_offline = False
-        self.data = {
-            "status": None,
-        }
-        self.failedupdates = 0
+        self.retry_policy = RetryPolicy.from_options(config_entry.options)
+        self.breaker = CircuitBreaker(self.retry_policy)
+        self.scheduler = AdaptivePollingScheduler()
+        self.farm = async_get_farm(hass)
+        self.file_list_coordinator = FlashForgeFileListCoordinator(
+            hass, self.connection, config_entry
+        )
 
-    async def async_update_data(self) -> dict[str, list[str] | str | None]:
+    async def async_update_data(self) -> PrinterSnapshot:
         """Update data via API."""
+        # An offline printer is only probed once per update.
+        attempts = 1 if self.breaker.is_open else None
         try:
-            await self.printer.update()
-            files = await self.printer.network.sendGetFileNames()
+            # The retry policy owns retries of the poll, not the session. Each
+            # attempt waits for its own slot in the farm.
+            await self.retry_policy.async_call(
+                partial(
+                    self.connection.async_request,
+                    self.printer.update,
+                    priority=PRIORITY_POLL,
+                    coalesce=True,
+                    reconnect=False,
+                    command_timeout=self.retry_policy.timeout,
+                ),
+                attempts=attempts,
+                gate=self.farm.async_slot,
+            )
         except (TimeoutError, ConnectionError) as err:
-            self.failedupdates += 1
-            if self.failedupdates >= MAX_FAILED_UPDATES:
-                self.failedupdates = 0
-                raise UpdateFailed(err) from err
-            return await self.async_update_data()
+            self.breaker.record_failure(err)
+            if self.breaker.is_open:
+                self.update_interval = timedelta(
+                    seconds=self.retry_policy.probe_interval
+                )
+            else:
+                self.update_interval = self.scheduler.offline_interval()
+            raise UpdateFailed(err) from err
 
-        if not files:
-            files = []
-        files = [f.removeprefix("/data/") for f in files]
-        self.failedupdates = 0
+        self.breaker.record_success()
+        data = PrinterSnapshot.from_printer(self.printer)
+        self.update_interval = self.scheduler.online_interval(
+            data.machine_status, [*data.extruders, *data.beds]
+        )
 
-        return {"status": self.printer.machine_status, "files": files}
+        return data
 
     async def async_config_entry_first_refresh(self) -> None:
         """Connect to printer and update with machine info."""
@@ -83,3 +118,47 @@ class FlashForgeDataUpdateCoordinator(DataUpdateCoordinator):
             serial_number=sn,
             hw_version=mac,
         )
+
+
+class FlashForgeFileListCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching the files stored on a FlashForge printer."""
+
+    # The file list is large and rarely changes, so it is polled on its own
+    # slow interval and refreshed on demand instead of with every status update.
+
+    config_entry: ConfigEntry
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: PrinterConnection,
+        config_entry: ConfigEntry,
+    ) -> None:
+        """Initialize."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DEFAULT_NAME}-{config_entry.entry_id}-files",
+            update_interval=timedelta(seconds=FILE_LIST_SCAN_INTERVAL),
+            update_method=self.async_update_data,
+        )
+        self.config_entry = config_entry
+        self.connection = connection
+        self.printer = connection.printer
+        self.data = []
+
+    async def async_update_data(self) -> list[str]:
+        """Fetch the file names stored on the printer."""
+        try:
+            files = await self.connection.async_request(
+                self.printer.network.sendGetFileNames,
+                priority=PRIORITY_POLL,
+                coalesce=True,
+                close=True,
+            )
+        except (TimeoutError, ConnectionError) as err:
+            raise UpdateFailed(err) from err
+
+        if not files:
+            return []
+        return [f.removeprefix("/data/") for f in files]
@@ -0,0 +1,59 @@
+"""Diagnostics support for Flashforge."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import CONF_SERIAL_NUMBER, DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .data_update_coordinator import FlashForgeDataUpdateCoordinator
+
+TO_REDACT = {CONF_SERIAL_NUMBER, "unique_id", "serial", "mac_address"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: FlashForgeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    printer = coordinator.printer
+
+    return async_redact_data(
+        {
+            "entry": {
+                "data": dict(entry.data),
+                "options": dict(entry.options),
+                "unique_id": entry.unique_id,
+            },
+            "printer": {
+                "machine_type": printer.machine_type,
+                "firmware": printer.firmware,
+                "serial": printer.serial,
+                "mac_address": printer.mac_address,
+            },
+            "coordinator": {
+                "last_update_success": coordinator.last_update_success,
+                "last_exception": repr(coordinator.last_exception),
+                "update_interval": (
+                    coordinator.update_interval.total_seconds()
+                    if coordinator.update_interval
+                    else None
+                ),
+                "data": asdict(coordinator.data) if coordinator.data else None,
+            },
+            "connection": coordinator.connection.as_dict(),
+            "farm": coordinator.farm.as_dict(),
+            "retry": {
+                "policy": asdict(coordinator.retry_policy),
+                "breaker": coordinator.breaker.as_dict(),
+            },
+        },
+        TO_REDACT,
+    )
@@ -0,0 +1,230 @@
+"""Find FlashForge printers on the local network."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from ffpp import Discovery
+from ffpp.Printer import Printer
+from homeassistant.components.network import async_get_source_ip
+from homeassistant.config_entries import (
+    SOURCE_IGNORE,
+    SOURCE_INTEGRATION_DISCOVERY,
+    ConfigEntryState,
+)
+from homeassistant.const import CONF_IP_ADDRESS, CONF_NAME, CONF_PORT
+from homeassistant.core import callback
+from homeassistant.helpers import discovery_flow
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CONF_SERIAL_NUMBER,
+    DATA_DISCOVERY,
+    DATA_DISCOVERY_LOCK,
+    DEFAULT_PORT,
+    DISCOVERY_MAX_CONCURRENT_QUERIES,
+    DISCOVERY_QUERY_TIMEOUT,
+    DISCOVERY_SCAN_COOLDOWN,
+    DISCOVERY_SCAN_INTERVAL,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Container, Coroutine, Iterable
+    from datetime import datetime
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DiscoveredPrinter:
+    """A printer that answered discovery and its machine info."""
+
+    ip_address: str
+    port: int
+    serial: str | None
+    name: str | None
+
+    @property
+    def title(self) -> str:
+        """Return the title for a config entry of this printer."""
+        return self.name or self.serial or self.ip_address
+
+
+async def async_query_printer(
+    ip_address: str, port: int = DEFAULT_PORT
+) -> DiscoveredPrinter | None:
+    """Read the machine info of a printer, return None if it doesn't answer."""
+    printer = Printer(ip_address, port)
+    try:
+        async with asyncio.timeout(DISCOVERY_QUERY_TIMEOUT):
+            await printer.connect()
+    except (TimeoutError, ConnectionError) as err:
+        _LOGGER.debug("Printer %s not responding: %s", ip_address, err)
+        return None
+    return DiscoveredPrinter(ip_address, port, printer.serial, printer.machine_name)
+
+
+async def async_find_addresses(hass: HomeAssistant) -> list[str]:
+    """Return addresses of all printers that answer discovery."""
+    # Discovery listens on a fixed port, so only one search runs at a time.
+    lock: asyncio.Lock = hass.data.setdefault(DATA_DISCOVERY_LOCK, asyncio.Lock())
+    local_ip = await async_get_source_ip(hass)
+    async with lock:
+        responders = await Discovery.getPrinters(
+            hass.loop, limit=None, host_ip=local_ip
+        )
+    return list(dict.fromkeys(ip for _, ip in responders))
+
+
+async def async_query_printers(addresses: Iterable[str]) -> list[DiscoveredPrinter]:
+    """Read the machine info of printers, a few printers at a time."""
+    semaphore = asyncio.Semaphore(DISCOVERY_MAX_CONCURRENT_QUERIES)
+
+    async def query(ip_address: str) -> DiscoveredPrinter | None:
+        async with semaphore:
+            return await async_query_printer(ip_address)
+
+    printers = await asyncio.gather(*(query(ip) for ip in addresses))
+    return [printer for printer in printers if printer is not None]
+
+
+async def async_discover_printers(
+    hass: HomeAssistant, configured: Container[str] = ()
+) -> list[DiscoveredPrinter]:
+    """Return all printers that answer discovery and aren't configured yet."""
+    # Discovery collects every answer within its time window, then the machine
+    # info of all responders is read concurrently. Loaded printers only take
+    # one client and are known to be configured, so they aren't asked.
+    loaded = {
+        entry.data[CONF_IP_ADDRESS]
+        for entry in hass.config_entries.async_loaded_entries(DOMAIN)
+    }
+    addresses = await async_find_addresses(hass)
+    printers = await async_query_printers(ip for ip in addresses if ip not in loaded)
+    return [printer for printer in printers if printer.serial not in configured]
+
+
+@callback
+def async_get_scanner(hass: HomeAssistant) -> DiscoveryScanner:
+    """Return the background scanner, creating it if needed."""
+    if (scanner := hass.data.get(DATA_DISCOVERY)) is None:
+        scanner = hass.data[DATA_DISCOVERY] = DiscoveryScanner(hass)
+    return scanner
+
+
+class DiscoveryScanner:
+    """Search the network now and then and follow printers that moved."""
+
+    # Printers get their address from DHCP and may show up on a new address.
+    # The scanner keeps a map of serial number to address. A printer found on
+    # a new address is passed to the config flow, which updates the entry the
+    # same way as when the user adds the printer again. Printers that aren't
+    # configured are offered as discovered devices.
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.known: dict[str, str] = {}
+        self._debouncer: Debouncer[Coroutine[Any, Any, None]] = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=DISCOVERY_SCAN_COOLDOWN,
+            immediate=True,
+            function=self.async_scan,
+            background=True,
+        )
+        self._unsub_interval: CALLBACK_TYPE | None = None
+
+    @property
+    def scanning(self) -> bool:
+        """Return True if the network is scanned on an interval."""
+        return self._unsub_interval is not None
+
+    @callback
+    def async_start(self) -> None:
+        """Start scanning on an interval."""
+        if self._unsub_interval is not None:
+            return
+        self._unsub_interval = async_track_time_interval(
+            self.hass,
+            self._async_scheduled_scan,
+            timedelta(seconds=DISCOVERY_SCAN_INTERVAL),
+            name="FlashForge discovery",
+            cancel_on_shutdown=True,
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop scanning."""
+        if self._unsub_interval is not None:
+            self._unsub_interval()
+            self._unsub_interval = None
+        self._debouncer.async_cancel()
+
+    @callback
+    def async_request_scan(self) -> asyncio.Task[None]:
+        """Scan soon, used when a printer is not found on its address."""
+        # Also used before any entry is loaded, so it works without the timer.
+        return self.hass.async_create_background_task(
+            self._debouncer.async_call(), name="FlashForge discovery"
+        )
+
+    async def _async_scheduled_scan(self, _: datetime) -> None:
+        """Scan on the interval timer."""
+        await self._debouncer.async_call()
+
+    async def async_scan(self) -> None:
+        """Search the network and report printers on new addresses."""
+        entries = {
+            entry.unique_id: entry
+            for entry in self.hass.config_entries.async_entries(DOMAIN)
+            if entry.unique_id is not None
+        }
+        # A loaded entry has the right address, and its printer only takes
+        # one client, so it isn't asked for its serial number. Printers that
+        # aren't configured are only asked once.
+        for serial, entry in entries.items():
+            if entry.state is ConfigEntryState.LOADED:
+                self.known[serial] = entry.data[CONF_IP_ADDRESS]
+        known_addresses = {
+            ip
+            for serial, ip in self.known.items()
+            if serial not in entries or entries[serial].state is ConfigEntryState.LOADED
+        }
+
+        try:
+            addresses = await async_find_addresses(self.hass)
+        except OSError as err:
+            _LOGGER.debug("Printer discovery failed: %s", err)
+            return
+        unknown = [ip for ip in addresses if ip not in known_addresses]
+        for printer in await async_query_printers(unknown):
+            if printer.serial is None:
+                continue
+            self.known[printer.serial] = printer.ip_address
+            entry = entries.get(printer.serial)
+            if entry is not None and (
+                entry.source == SOURCE_IGNORE
+                or entry.data.get(CONF_IP_ADDRESS) == printer.ip_address
+            ):
+                continue
+            _LOGGER.debug("Printer %s found on %s", printer.serial, printer.ip_address)
+            discovery_flow.async_create_flow(
+                self.hass,
+                DOMAIN,
+                context={"source": SOURCE_INTEGRATION_DISCOVERY},
+                data={
+                    CONF_IP_ADDRESS: printer.ip_address,
+                    CONF_PORT: printer.port,
+                    CONF_SERIAL_NUMBER: printer.serial,
+                    CONF_NAME: printer.name,
+                },
+            )
@@ -0,0 +1,175 @@
+"""Schedule polls of all FlashForge printers from one place."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import (
+    SIGNAL_CONFIG_ENTRY_CHANGED,
+    ConfigEntryChange,
+    ConfigEntryState,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+
+from .connection import CommandStats
+from .const import (
+    ACTIVE_MACHINE_STATUSES,
+    DATA_FARM,
+    DOMAIN,
+    FARM_MAX_CONCURRENT_POLLS,
+    FARM_POLL_SPACING,
+    SIGNAL_FARM_HOST,
+    SIGNAL_FARM_UPDATED,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .data_update_coordinator import FlashForgeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_farm(hass: HomeAssistant) -> FlashForgeFarm:
+    """Return the farm shared by all config entries, creating it if needed."""
+    if (farm := hass.data.get(DATA_FARM)) is None:
+        farm = hass.data[DATA_FARM] = FlashForgeFarm(hass)
+        # Printers that failed setup have no coordinator, follow their entries.
+        async_dispatcher_connect(
+            hass, SIGNAL_CONFIG_ENTRY_CHANGED, farm.async_entry_changed
+        )
+    return farm
+
+
+class FlashForgeFarm:
+    """Stagger and limit printer polls and summarize all printers."""
+
+    # Every config entry has its own coordinator timer, with many printers the
+    # timers line up and all printers are polled in the same instant. Polls
+    # pass through this gate, which spaces their start and caps how many
+    # printers are talked to at once. The farm also keeps the summary of all
+    # printers, its sensors are added by one of the entries, the host.
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.coordinators: dict[str, FlashForgeDataUpdateCoordinator] = {}
+        self.host_entry_id: str | None = None
+        self.stats = CommandStats()
+        self.in_flight = 0
+        self.printing = 0
+        self.idle = 0
+        self.offline = 0
+        self.progress: float | None = None
+        self._semaphore = asyncio.Semaphore(FARM_MAX_CONCURRENT_POLLS)
+        self._next_slot = 0.0
+
+    @callback
+    def async_register(
+        self, coordinator: FlashForgeDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """Add a printer to the farm, return a callback that removes it."""
+        entry_id = coordinator.config_entry.entry_id
+        self.coordinators[entry_id] = coordinator
+        unsub = coordinator.async_add_listener(self._async_update_summary)
+        if self.host_entry_id is None:
+            self._set_host(entry_id)
+        self._async_update_summary()
+
+        @callback
+        def unregister() -> None:
+            unsub()
+            self.coordinators.pop(entry_id, None)
+            if self.host_entry_id == entry_id:
+                self._set_host(next(iter(self.coordinators), None))
+            self._async_update_summary()
+
+        return unregister
+
+    def _set_host(self, entry_id: str | None) -> None:
+        """Move the farm sensors to another entry."""
+        self.host_entry_id = entry_id
+        async_dispatcher_send(self.hass, SIGNAL_FARM_HOST)
+
+    async def async_poll(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a poll when the farm has room for it."""
+        async with self.async_slot():
+            return await func()
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[None]:
+        """Wait for room in the farm and hold it for one request."""
+        queued = time.monotonic()
+        if len(self.coordinators) > 1:
+            # Reserve the next start slot, polls start FARM_POLL_SPACING apart.
+            slot = max(queued, self._next_slot)
+            self._next_slot = slot + FARM_POLL_SPACING
+            if (delay := slot - queued) > 0:
+                await asyncio.sleep(delay)
+        async with self._semaphore:
+            start = time.monotonic()
+            self.in_flight += 1
+            error = True
+            try:
+                yield
+                error = False
+            finally:
+                self.in_flight -= 1
+                self.stats.record(time.monotonic() - start, start - queued, error=error)
+
+    @callback
+    def async_entry_changed(
+        self, change: ConfigEntryChange, entry: ConfigEntry
+    ) -> None:
+        """Update the summary when a printer entry changes state."""
+        if entry.domain == DOMAIN and change is not ConfigEntryChange.ADDED:
+            self._async_update_summary()
+
+    @callback
+    def _async_update_summary(self) -> None:
+        """Count printers per state and tell the farm sensors."""
+        printing = idle = offline = 0
+        progress: list[float] = []
+        for coordinator in self.coordinators.values():
+            data = coordinator.data
+            if not coordinator.last_update_success or data is None:
+                offline += 1
+            elif data.machine_status in ACTIVE_MACHINE_STATUSES:
+                printing += 1
+                if data.print_percent is not None:
+                    progress.append(float(data.print_percent))
+            else:
+                idle += 1
+        # Printers that were down at startup never got to register.
+        offline += sum(
+            1
+            for entry in self.hass.config_entries.async_entries(DOMAIN)
+            if entry.state is ConfigEntryState.SETUP_RETRY
+            and entry.entry_id not in self.coordinators
+        )
+        self.printing, self.idle, self.offline = printing, idle, offline
+        self.progress = round(sum(progress) / len(progress), 1) if progress else None
+        async_dispatcher_send(self.hass, SIGNAL_FARM_UPDATED)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return farm state and poll stats for diagnostics."""
+        return {
+            "printers": len(self.coordinators),
+            "printing": self.printing,
+            "idle": self.idle,
+            "offline": self.offline,
+            "in_flight": self.in_flight,
+            "polls": self.stats.as_dict(),
+        }
@@ -56,19 +56,23 @@ class FlashForgeLightEntity(CoordinatorEntity, LightEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_is_on = self.coordinator.printer.led
+        self._attr_is_on = self.coordinator.data.led
         self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs):
         """Turn the light on."""
-        await self.coordinator.printer.setLed(True)
+        await self.coordinator.connection.async_request(
+            self.coordinator.printer.network.sendSetLedState, state=True
+        )
 
         # Update the data
         await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs):
         """Turn the light off."""
-        await self.coordinator.printer.setLed(False)
+        await self.coordinator.connection.async_request(
+            self.coordinator.printer.network.sendSetLedState, state=False
+        )
 
         # Update the data
         await self.coordinator.async_request_refresh()
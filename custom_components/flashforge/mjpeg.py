@@ -0,0 +1,279 @@
+"""Share one MJPEG connection to the printer camera between all viewers."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import aiohttp
+from aiohttp import hdrs
+from homeassistant.components.camera import Image
+from homeassistant.components.camera.img_util import scale_jpeg_camera_image
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    MJPEG_CHUNK_SIZE,
+    MJPEG_CONNECT_TIMEOUT,
+    SCALED_FRAME_CACHE_SIZE,
+    SNAPSHOT_TIMEOUT,
+    VIEWER_QUEUE_SIZE,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+JPEG_SOI = b"\xff\xd8"
+JPEG_EOI = b"\xff\xd9"
+
+
+CONTENT_LENGTH = re.compile(rb"content-length\s*:\s*(\d+)", re.IGNORECASE)
+HEADER_END = b"\r\n\r\n"
+
+
+def parse_boundary(content_type: str | None) -> bytes | None:
+    """Return the multipart boundary from a Content-Type header."""
+    if content_type and (match := re.search(r'boundary="?([^";]+)"?', content_type)):
+        return match.group(1).strip().encode()
+    return None
+
+
+class MjpegFrameParser:
+    """Incrementally split an MJPEG byte stream into JPEG frames."""
+
+    # Data is appended to one bytearray and scanning resumes where the last
+    # call stopped, so every byte is scanned once. Consumed bytes are removed
+    # once per call, only the unfinished frame is moved. With a multipart
+    # boundary the Content-Length header of each part is used when present,
+    # otherwise frames are found by their SOI and EOI markers.
+
+    def __init__(self, boundary: bytes | None = None) -> None:
+        """Initialize."""
+        self._boundary = boundary
+        self._buffer = bytearray()
+        self._scan = 0
+        self._body_start = -1
+        self._length: int | None = None
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Add data from the stream and return the frames it completed."""
+        buffer = self._buffer
+        buffer += data
+        frames: list[bytes] = []
+        consumed = 0
+
+        while True:
+            if self._body_start < 0 and not self._find_part():
+                break
+            if self._length is not None:
+                end = self._body_start + self._length
+                if len(buffer) < end:
+                    break
+            else:
+                eoi = buffer.find(JPEG_EOI, self._scan)
+                if eoi == -1:
+                    # Keep last byte, it may be the first half of the marker.
+                    self._scan = max(self._body_start + 2, len(buffer) - 1)
+                    break
+                end = eoi + 2
+            with memoryview(buffer) as view:
+                frames.append(bytes(view[self._body_start : end]))
+            consumed = self._scan = end
+            self._body_start = -1
+
+        if consumed:
+            del buffer[:consumed]
+            self._scan -= consumed
+            if self._body_start >= 0:
+                self._body_start -= consumed
+        return frames
+
+    def _find_part(self) -> bool:
+        """Find the start of the next frame, return False if more data is needed."""
+        buffer = self._buffer
+        if self._boundary is None:
+            soi = buffer.find(JPEG_SOI, self._scan)
+            if soi == -1:
+                self._scan = max(self._scan, len(buffer) - 1)
+                return False
+            self._body_start = soi
+            self._length = None
+            self._scan = soi + 2
+            return True
+
+        start = buffer.find(self._boundary, self._scan)
+        if start == -1:
+            self._scan = max(self._scan, len(buffer) - len(self._boundary) + 1)
+            return False
+        header_end = buffer.find(HEADER_END, start)
+        if header_end == -1:
+            self._scan = start
+            return False
+        match = CONTENT_LENGTH.search(buffer, start, header_end)
+        self._length = int(match.group(1)) if match else None
+        self._body_start = self._scan = header_end + len(HEADER_END)
+        return True
+
+
+class MjpegStreamHub:
+    """Fan out frames from one upstream MJPEG connection to many viewers."""
+
+    # The camera server in the printer copes badly with more than one or two
+    # clients. The upstream connection is opened for the first viewer and
+    # closed when the last one leaves. Each viewer gets a small queue, a slow
+    # viewer loses its oldest frames instead of slowing down the others.
+
+    def __init__(self, hass: HomeAssistant, url: str) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.url = url
+        self.latest_frame: bytes | None = None
+        self.frame_seq = 0
+        self.frame_time = 0.0
+        self._viewers: set[asyncio.Queue[bytes | None]] = set()
+        self._upstream: asyncio.Task[None] | None = None
+
+    @property
+    def viewers(self) -> int:
+        """Return number of connected viewers."""
+        return len(self._viewers)
+
+    @property
+    def is_streaming(self) -> bool:
+        """Return True if the upstream connection is open."""
+        return self._upstream is not None and not self._upstream.done()
+
+    @contextlib.asynccontextmanager
+    async def async_subscribe(self) -> AsyncIterator[asyncio.Queue[bytes | None]]:
+        """Subscribe to frames, a None frame means the upstream has ended."""
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._viewers.add(queue)
+        if not self.is_streaming:
+            self._upstream = self.hass.async_create_background_task(
+                self._async_stream(), name=f"FlashForge MJPEG {self.url}"
+            )
+        try:
+            yield queue
+        finally:
+            self._viewers.discard(queue)
+            if not self._viewers:
+                await self.async_stop()
+
+    async def async_get_frame(self, max_age: float) -> bytes | None:
+        """Return a frame that is at most max_age seconds old."""
+        if (
+            self.latest_frame is not None
+            and time.monotonic() - self.frame_time <= max_age
+        ):
+            return self.latest_frame
+
+        # Wait for the next frame, this opens a short lived connection to the
+        # camera if nobody is watching the live stream.
+        async with self.async_subscribe() as frames:
+            try:
+                async with asyncio.timeout(SNAPSHOT_TIMEOUT):
+                    return await frames.get()
+            except TimeoutError:
+                _LOGGER.debug("No frame from camera %s", self.url)
+                return None
+
+    async def async_stop(self) -> None:
+        """Close the upstream connection."""
+        if self._upstream is None:
+            return
+        upstream, self._upstream = self._upstream, None
+        upstream.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await upstream
+
+    async def _async_stream(self) -> None:
+        """Read frames from the camera and publish them to the viewers."""
+        session = async_get_clientsession(self.hass)
+        try:
+            async with session.get(
+                self.url,
+                timeout=aiohttp.ClientTimeout(sock_connect=MJPEG_CONNECT_TIMEOUT),
+            ) as response:
+                response.raise_for_status()
+                parser = MjpegFrameParser(
+                    parse_boundary(response.headers.get(hdrs.CONTENT_TYPE))
+                )
+                async for chunk in response.content.iter_chunked(MJPEG_CHUNK_SIZE):
+                    for frame in parser.feed(chunk):
+                        self._publish(frame)
+        except (TimeoutError, aiohttp.ClientError) as err:
+            _LOGGER.debug("Camera stream %s ended: %s", self.url, err)
+        finally:
+            for queue in self._viewers:
+                self._put(queue, None)
+
+    def _publish(self, frame: bytes) -> None:
+        """Publish a frame to all viewers."""
+        self.latest_frame = frame
+        self.frame_seq += 1
+        self.frame_time = time.monotonic()
+        for queue in self._viewers:
+            self._put(queue, frame)
+
+    @staticmethod
+    def _put(queue: asyncio.Queue[bytes | None], frame: bytes | None) -> None:
+        """Put a frame in a viewer queue, dropping the oldest if it is full."""
+        # The end of stream marker is always added so no frame is lost for it.
+        if frame is not None and queue.qsize() >= VIEWER_QUEUE_SIZE:
+            queue.get_nowait()
+        queue.put_nowait(frame)
+
+
+class ScaledFrameCache:
+    """Scale frames in a worker thread and keep the latest results."""
+
+    # Dashboards request the same thumbnail size over and over, the scaled
+    # frame is kept per frame sequence number and size, least recently used
+    # entries are evicted. Concurrent requests for the same entry share one
+    # scaling job.
+
+    def __init__(
+        self, hass: HomeAssistant, size: int = SCALED_FRAME_CACHE_SIZE
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._size = size
+        self._cache: OrderedDict[tuple[int, int, int], asyncio.Future[bytes]] = (
+            OrderedDict()
+        )
+
+    async def async_scale(
+        self, seq: int | None, frame: bytes, width: int, height: int
+    ) -> bytes:
+        """Return frame scaled down to about width x height."""
+        if seq is None:
+            return await self._async_scale(frame, width, height)
+
+        key = (seq, width, height)
+        if (future := self._cache.get(key)) is not None:
+            self._cache.move_to_end(key)
+            return await asyncio.shield(future)
+
+        future = self.hass.async_create_task(self._async_scale(frame, width, height))
+        self._cache[key] = future
+        while len(self._cache) > self._size:
+            self._cache.popitem(last=False)
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            self._cache.pop(key, None)
+            raise
+
+    async def _async_scale(self, frame: bytes, width: int, height: int) -> bytes:
+        """Decode, scale and encode a frame in the executor."""
+        return await self.hass.async_add_executor_job(
+            scale_jpeg_camera_image, Image("image/jpeg", frame), width, height
+        )
@@ -0,0 +1,140 @@
+"""Retry policy and circuit breaker for requests to FlashForge printers."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    CONF_ATTEMPT_TIMEOUT,
+    CONF_FAILURE_THRESHOLD,
+    CONF_PROBE_INTERVAL,
+    CONF_RETRY_ATTEMPTS,
+    CONF_RETRY_BACKOFF,
+    DEFAULT_ATTEMPT_TIMEOUT,
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_PROBE_INTERVAL,
+    DEFAULT_RETRY_BACKOFF,
+    MAX_FAILED_UPDATES,
+    MAX_RETRY_BACKOFF,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Mapping
+    from contextlib import AbstractAsyncContextManager
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How many times and how often to retry a failed printer request."""
+
+    attempts: int = MAX_FAILED_UPDATES
+    timeout: float = DEFAULT_ATTEMPT_TIMEOUT
+    backoff: float = DEFAULT_RETRY_BACKOFF
+    max_backoff: float = MAX_RETRY_BACKOFF
+    failure_threshold: int = DEFAULT_FAILURE_THRESHOLD
+    probe_interval: float = DEFAULT_PROBE_INTERVAL
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> RetryPolicy:
+        """Create a policy from config entry options."""
+        return cls(
+            attempts=options.get(CONF_RETRY_ATTEMPTS, MAX_FAILED_UPDATES),
+            timeout=options.get(CONF_ATTEMPT_TIMEOUT, DEFAULT_ATTEMPT_TIMEOUT),
+            backoff=options.get(CONF_RETRY_BACKOFF, DEFAULT_RETRY_BACKOFF),
+            failure_threshold=options.get(
+                CONF_FAILURE_THRESHOLD, DEFAULT_FAILURE_THRESHOLD
+            ),
+            probe_interval=options.get(CONF_PROBE_INTERVAL, DEFAULT_PROBE_INTERVAL),
+        )
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay before retry number attempt, with jitter."""
+        delay = min(self.max_backoff, self.backoff * 2**attempt)
+        return delay / 2 + random.uniform(0, delay / 2)  # noqa: S311
+
+    async def async_call(
+        self,
+        func: Callable[[], Awaitable[Any]],
+        attempts: int | None = None,
+        gate: Callable[[], AbstractAsyncContextManager[Any]] = nullcontext,
+    ) -> Any:
+        """Call func until it succeeds or all attempts are used."""
+        # Each attempt passes the gate on its own, so nothing is held while
+        # waiting for the next attempt, and waiting at the gate doesn't count
+        # against the attempt timeout.
+        attempts = self.attempts if attempts is None else attempts
+        for attempt in range(attempts):
+            try:
+                async with gate(), asyncio.timeout(self.timeout):
+                    return await func()
+            except (TimeoutError, ConnectionError):
+                if attempt + 1 >= attempts:
+                    raise
+            await asyncio.sleep(self.delay(attempt))
+        return None
+
+
+class BreakerState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+
+
+class CircuitBreaker:
+    """Mark a printer offline after repeated failed updates."""
+
+    # While open the printer is only probed with a single attempt at the
+    # policy's probe interval, the first success closes it again.
+
+    def __init__(self, policy: RetryPolicy) -> None:
+        """Initialize."""
+        self.policy = policy
+        self.state = BreakerState.CLOSED
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.opened_at: float | None = None
+        self.last_error: str | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if printer is considered offline."""
+        return self.state is BreakerState.OPEN
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful update."""
+        self.state = BreakerState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def record_failure(self, err: Exception) -> None:
+        """Count a failed update and open the breaker at the threshold."""
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        self.last_error = repr(err)
+        if (
+            not self.is_open
+            and self.consecutive_failures >= self.policy.failure_threshold
+        ):
+            self.state = BreakerState.OPEN
+            self.opened_at = time.monotonic()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "total_failures": self.total_failures,
+            "open_for": (
+                round(time.monotonic() - self.opened_at, 1)
+                if self.opened_at is not None
+                else None
+            ),
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,78 @@
+"""Adaptive polling interval for the FlashForge coordinator."""
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from .const import (
+    ACTIVE_MACHINE_STATUSES,
+    IDLE_TIMEOUT,
+    SCAN_INTERVAL,
+    SCAN_INTERVAL_ACTIVE,
+    SCAN_INTERVAL_IDLE,
+    SCAN_INTERVAL_OFFLINE_MAX,
+    TEMP_SETTLED_DELTA,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from ffpp.Printer import temperatures as Tool  # noqa: N812
+
+
+def is_converging(tools: Iterable[Tool]) -> bool:
+    """Return True if any tool is heating or cooling towards a set target."""
+    return any(
+        tool.target > 0 and abs(tool.target - tool.now) > TEMP_SETTLED_DELTA
+        for tool in tools
+    )
+
+
+class AdaptivePollingScheduler:
+    """Pick the next poll interval from the last parsed printer status."""
+
+    # Printing or heating printers are polled fast, printers that have been
+    # READY for a while are polled slowly and offline printers are polled with
+    # an exponential backoff.
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._idle_since: float | None = None
+        self._offline_interval: float | None = None
+
+    def online_interval(
+        self,
+        machine_status: str | None,
+        tools: Iterable[Tool],
+        now: float | None = None,
+    ) -> timedelta:
+        """Return the interval to use after a successful update."""
+        now = time.monotonic() if now is None else now
+        self._offline_interval = None
+
+        if machine_status in ACTIVE_MACHINE_STATUSES or is_converging(tools):
+            self._idle_since = None
+            return timedelta(seconds=SCAN_INTERVAL_ACTIVE)
+
+        if machine_status != "READY":
+            self._idle_since = None
+            return timedelta(seconds=SCAN_INTERVAL)
+
+        if self._idle_since is None:
+            self._idle_since = now
+        if now - self._idle_since >= IDLE_TIMEOUT:
+            return timedelta(seconds=SCAN_INTERVAL_IDLE)
+        return timedelta(seconds=SCAN_INTERVAL)
+
+    def offline_interval(self) -> timedelta:
+        """Return the interval to use after a failed update."""
+        self._idle_since = None
+        if self._offline_interval is None:
+            self._offline_interval = SCAN_INTERVAL
+        else:
+            self._offline_interval = min(
+                self._offline_interval * 2, SCAN_INTERVAL_OFFLINE_MAX
+            )
+        return timedelta(seconds=self._offline_interval)
@@ -15,7 +15,10 @@ if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-    from .data_update_coordinator import FlashForgeDataUpdateCoordinator
+    from .data_update_coordinator import (
+        FlashForgeDataUpdateCoordinator,
+        FlashForgeFileListCoordinator,
+    )
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,11 +40,15 @@ class FlashForgeSelect(CoordinatorEntity, SelectEntity):
     _attr_has_entity_name = True
     _attr_should_poll = False
 
+    coordinator: FlashForgeFileListCoordinator
+
     def __init__(
         self, coordinator: FlashForgeDataUpdateCoordinator, options: list = []
     ) -> None:
         """Initialize the Demo select entity."""
-        super().__init__(coordinator)
+        # Files are fetched by a separate coordinator with its own interval.
+        super().__init__(coordinator.file_list_coordinator)
+        options = options or coordinator.file_list_coordinator.data or []
         self._attr_unique_id = f"{coordinator.config_entry.unique_id}_select"
         self._attr_current_option = options[0] if options else None
         self._attr_icon = "mdi:file-cad"
@@ -52,10 +59,7 @@ class FlashForgeSelect(CoordinatorEntity, SelectEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        try:
-            self._attr_options = self.coordinator.data["files"]
-        except KeyError:
-            self._attr_options = []
+        self._attr_options = self.coordinator.data or []
         self.async_write_ha_state()
 
     async def async_select_option(self, option: str) -> None:
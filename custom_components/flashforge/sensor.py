@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -13,20 +14,29 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.const import PERCENTAGE, UnitOfTemperature
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import (
+    CONF_TEMP_DEADBAND,
+    DEFAULT_NAME,
+    DEFAULT_TEMP_DEADBAND,
+    DOMAIN,
+    SIGNAL_FARM_HOST,
+    SIGNAL_FARM_UPDATED,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
-    from ffpp.Printer import Printer
-    from ffpp.Printer import temperatures as Tool  # noqa: N812
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .data_update_coordinator import FlashForgeDataUpdateCoordinator
+    from .farm import FlashForgeFarm
+    from .snapshot import PrinterSnapshot, ToolTemperature
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,52 +45,59 @@ _LOGGER = logging.getLogger(__name__)
 class FlashforgeSensorEntityDescription(SensorEntityDescription):
     """Sensor entity description with added value fnc."""
 
-    value_fnc: Callable[[Printer], str | int | None] | None = None
+    value_fnc: Callable[[PrinterSnapshot], str | int | None] | None = None
 
 
 @dataclass(frozen=True)
 class FlashforgeTempSensorEntityDescription(FlashforgeSensorEntityDescription):
     """Sensor entity description for temperature sensors."""
 
-    value_fnc: Callable[[Tool], float] | None = None
+    value_fnc: Callable[[ToolTemperature], float] | None = None
+
+
+@dataclass(frozen=True)
+class FlashforgeFarmSensorEntityDescription(SensorEntityDescription):
+    """Sensor entity description for sensors summarizing all printers."""
+
+    value_fnc: Callable[[FlashForgeFarm], int | float | None] | None = None
 
 
 SENSORS: tuple[FlashforgeSensorEntityDescription, ...] = (
     FlashforgeSensorEntityDescription(
         key="status",
         icon="mdi:printer-3d",
-        value_fnc=lambda printer: printer.machine_status,
+        value_fnc=lambda data: data.machine_status,
     ),
     FlashforgeSensorEntityDescription(
         key="job_percentage",
         icon="mdi:file-percent",
         native_unit_of_measurement=PERCENTAGE,
-        value_fnc=lambda printer: printer.print_percent,
+        value_fnc=lambda data: data.print_percent,
     ),
     FlashforgeSensorEntityDescription(
         key="file",
         icon="mdi:file-cad",
-        value_fnc=lambda printer: printer.job_file,
+        value_fnc=lambda data: data.job_file,
     ),
     FlashforgeSensorEntityDescription(
         key="layers",
         icon="mdi:layers-triple",
-        value_fnc=lambda printer: printer.job_layers,
+        value_fnc=lambda data: data.job_layers,
     ),
     FlashforgeSensorEntityDescription(
         key="print_layer",
         icon="mdi:layers-edit",
-        value_fnc=lambda printer: printer.print_layer,
+        value_fnc=lambda data: data.print_layer,
     ),
     FlashforgeSensorEntityDescription(
         key="print_status",
         icon="mdi:printer-3d",
-        value_fnc=lambda printer: printer.status,
+        value_fnc=lambda data: data.status,
     ),
     FlashforgeSensorEntityDescription(
         key="move_mode",
         icon="mdi:move-resize",
-        value_fnc=lambda printer: printer.move_mode,
+        value_fnc=lambda data: data.move_mode,
     ),
 )
 TEMP_SENSORS: tuple[FlashforgeSensorEntityDescription, ...] = (
@@ -99,6 +116,33 @@ TEMP_SENSORS: tuple[FlashforgeSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
     ),
 )
+FARM_SENSORS: tuple[FlashforgeFarmSensorEntityDescription, ...] = (
+    FlashforgeFarmSensorEntityDescription(
+        key="printing",
+        icon="mdi:printer-3d-nozzle",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fnc=lambda farm: farm.printing,
+    ),
+    FlashforgeFarmSensorEntityDescription(
+        key="idle",
+        icon="mdi:printer-3d",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fnc=lambda farm: farm.idle,
+    ),
+    FlashforgeFarmSensorEntityDescription(
+        key="offline",
+        icon="mdi:printer-3d-off",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fnc=lambda farm: farm.offline,
+    ),
+    FlashforgeFarmSensorEntityDescription(
+        key="progress",
+        icon="mdi:file-percent",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fnc=lambda farm: farm.progress,
+    ),
+)
 
 
 async def async_setup_entry(
@@ -114,33 +158,21 @@ async def async_setup_entry(
     entities: list[SensorEntity] = []
 
     if coordinator.printer.connected:
-        # Loop all extruders and add current and target temp sensors.
-        for i, tool in enumerate(coordinator.printer.extruder_tools):
-            name = (
-                f"extruder{i}"
-                if len(coordinator.printer.extruder_tools) > 1
-                else "extruder"
-            )
-            for description in TEMP_SENSORS:
-                sensor = FlashForgeTempSensor(
-                    coordinator=coordinator,
-                    description=description,
-                    name=name,
-                    tool_name=tool.name,
+        # Loop all extruders and beds and add current and target temp sensors.
+        for group, prefix in (("extruders", "extruder"), ("beds", "bed")):
+            tools = getattr(coordinator.data, group)
+            for i in range(len(tools)):
+                name = f"{prefix}{i}" if len(tools) > 1 else prefix
+                entities.extend(
+                    FlashForgeTempSensor(
+                        coordinator=coordinator,
+                        description=description,
+                        name=name,
+                        tool_group=group,
+                        tool_index=i,
+                    )
+                    for description in TEMP_SENSORS
                 )
-                entities.append(sensor)
-
-        # Loop all beds and add current and target temp sensors.
-        for i, tool in enumerate(coordinator.printer.bed_tools):
-            name = f"bed{i}" if len(coordinator.printer.bed_tools) > 1 else "bed"
-            for description in TEMP_SENSORS:
-                sensor = FlashForgeTempSensor(
-                    coordinator=coordinator,
-                    description=description,
-                    name=name,
-                    tool_name=tool.name,
-                )
-                entities.append(sensor)
 
     for description in SENSORS:
         _LOGGER.debug(f"setup {description}")  # noqa: G004
@@ -153,6 +185,26 @@ async def async_setup_entry(
 
     async_add_entities(entities)
 
+    # Sensors of the whole farm are added by one entry, the host, and are
+    # added by another entry if the host is unloaded.
+    farm = coordinator.farm
+    farm_entities: list[FlashForgeFarmSensor] = []
+
+    @callback
+    def async_add_farm_sensors() -> None:
+        """Add the farm sensors if this entry became the host."""
+        if farm.host_entry_id != config_entry.entry_id or farm_entities:
+            return
+        farm_entities.extend(
+            FlashForgeFarmSensor(farm, description) for description in FARM_SENSORS
+        )
+        async_add_entities(farm_entities)
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_FARM_HOST, async_add_farm_sensors)
+    )
+    async_add_farm_sensors()
+
 
 class FlashForgeSensor(CoordinatorEntity, SensorEntity):
     """Representation of an FlashForge sensor."""
@@ -165,7 +217,6 @@ class FlashForgeSensor(CoordinatorEntity, SensorEntity):
         coordinator: FlashForgeDataUpdateCoordinator,
         description: FlashforgeSensorEntityDescription,
         name: str = "",
-        tool_name: str | None = None,
     ) -> None:
         """Initialize a new Flashforge sensor."""
         super().__init__(coordinator)
@@ -181,18 +232,39 @@ class FlashForgeSensor(CoordinatorEntity, SensorEntity):
             f"{coordinator.config_entry.unique_id}_{name}{description.key}"
         )
 
-        self.tool_name = tool_name
+        self._value_fn = self._value_accessor()
+        self._attr_native_value = self._compute_value()
+        self._written: tuple[Any, bool] = (self._attr_native_value, self.available)
 
-    @property
-    def native_value(self) -> str | int | float | None:
-        """Return sensor state."""
-        if self.entity_description.value_fnc is None:
-            return None
+    def _value_accessor(self) -> Callable[[PrinterSnapshot], Any]:
+        """Return the function that reads the value from a snapshot."""
+        return self.entity_description.value_fnc or (lambda _: None)
 
-        if isinstance(self.entity_description, FlashforgeSensorEntityDescription):
-            # If it's a normal sensor we can just pass the printer
-            return self.entity_description.value_fnc(self.coordinator.printer)
-        return None
+    def _compute_value(self) -> str | int | float | None:
+        """Return sensor state from the latest printer snapshot."""
+        if (data := self.coordinator.data) is None:
+            return None
+        return self._value_fn(data)
+
+    def _value_changed(self, old: Any, new: Any) -> bool:
+        """Return True if the new value is worth a state write."""
+        return old != new
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Compute the value once and write state only if it changed."""
+        # Every write is recorded and sent to all websocket clients, so an
+        # unchanged value is not written again.
+        value = self._compute_value()
+        available = self.available
+        written_value, written_available = self._written
+        if available == written_available and not self._value_changed(
+            written_value, value
+        ):
+            return
+        self._attr_native_value = value
+        self._written = (value, available)
+        self.async_write_ha_state()
 
 
 class FlashForgeTempSensor(FlashForgeSensor):
@@ -200,17 +272,78 @@ class FlashForgeTempSensor(FlashForgeSensor):
 
     entity_description: FlashforgeTempSensorEntityDescription
 
-    @property
-    def native_value(self) -> float | None:
-        """Return sensor state."""
+    def __init__(
+        self,
+        coordinator: FlashForgeDataUpdateCoordinator,
+        description: FlashforgeTempSensorEntityDescription,
+        name: str,
+        tool_group: str,
+        tool_index: int,
+    ) -> None:
+        """Initialize a new Flashforge temperature sensor."""
+        self.tool_group = tool_group
+        self.tool_index = tool_index
+        self._deadband = coordinator.config_entry.options.get(
+            CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND
+        )
+        super().__init__(coordinator, description, name)
+
+    def _value_accessor(self) -> Callable[[PrinterSnapshot], Any]:
+        """Return the function that reads the tool temperature from a snapshot."""
+        value_fnc = self.entity_description.value_fnc
+        if value_fnc is None:
+            return lambda _: None
+        tools = attrgetter(self.tool_group)
+        index = self.tool_index
+
+        def value(data: PrinterSnapshot) -> float | None:
+            group = tools(data)
+            return value_fnc(group[index]) if index < len(group) else None
+
+        return value
+
+    def _value_changed(self, old: Any, new: Any) -> bool:
+        """Return True if the temperature moved more than the deadband."""
+        if old is None or new is None:
+            return old != new
+        return abs(new - old) > self._deadband
+
+
+class FlashForgeFarmSensor(SensorEntity):
+    """Representation of a sensor summarizing all FlashForge printers."""
+
+    _attr_should_poll = False
+    entity_description: FlashforgeFarmSensorEntityDescription
+
+    def __init__(
+        self, farm: FlashForgeFarm, description: FlashforgeFarmSensorEntityDescription
+    ) -> None:
+        """Initialize a new farm sensor."""
+        self.farm = farm
+        self.entity_description = description
+        self._attr_name = f"{DEFAULT_NAME} farm {description.key}"
+        self._attr_unique_id = f"{DOMAIN}_farm_{description.key}"
+        self._attr_native_value = self._compute_value()
+
+    def _compute_value(self) -> int | float | None:
+        """Return sensor state from the farm summary."""
         if self.entity_description.value_fnc is None:
             return None
-        if self.tool_name:
-            # If toolname is set we need to get that tool and pass it to the lambda.
-            tool = self.coordinator.printer.extruder_tools.get(self.tool_name)
-            if tool is None:
-                tool = self.coordinator.printer.bed_tools.get(self.tool_name)
-            if tool is not None:
-                return self.entity_description.value_fnc(tool)
-
-        return None
+        return self.entity_description.value_fnc(self.farm)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to farm updates."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_FARM_UPDATED, self._handle_farm_update
+            )
+        )
+
+    @callback
+    def _handle_farm_update(self) -> None:
+        """Write state if the summary changed."""
+        value = self._compute_value()
+        if value == self._attr_native_value:
+            return
+        self._attr_native_value = value
+        self.async_write_ha_state()
@@ -0,0 +1,60 @@
+"""Immutable view of the printer state at one coordinator update."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from ffpp.Printer import Printer
+    from ffpp.Printer import temperatures as Tool  # noqa: N812
+
+
+class ToolTemperature(NamedTuple):
+    """Current and target temperature of one extruder or bed."""
+
+    name: str
+    now: float
+    target: float
+
+
+def _temperatures(tools: Iterable[Tool]) -> tuple[ToolTemperature, ...]:
+    """Return temperatures of tools in the order the printer reports them."""
+    return tuple(ToolTemperature(tool.name, tool.now, tool.target) for tool in tools)
+
+
+@dataclass(frozen=True, slots=True)
+class PrinterSnapshot:
+    """Printer values read in one update, shared by all entities."""
+
+    # The ffpp printer object is changed in place by every command, entities
+    # read this snapshot instead so all of them show the same update.
+
+    machine_status: str | None
+    move_mode: str | None
+    status: str | None
+    led: bool
+    job_file: str | None
+    print_percent: str | None
+    print_layer: str | None
+    job_layers: str | None
+    extruders: tuple[ToolTemperature, ...]
+    beds: tuple[ToolTemperature, ...]
+
+    @classmethod
+    def from_printer(cls, printer: Printer) -> PrinterSnapshot:
+        """Copy the current values of the printer."""
+        return cls(
+            machine_status=printer.machine_status,
+            move_mode=printer.move_mode,
+            status=printer.status,
+            led=printer.led,
+            job_file=printer.job_file,
+            print_percent=printer.print_percent,
+            print_layer=printer.print_layer,
+            job_layers=printer.job_layers,
+            extruders=_temperatures(printer.extruder_tools),
+            beds=_temperatures(printer.bed_tools),
+        )
@@ -0,0 +1,272 @@
+"""Record a timelapse of a print from the printer camera."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import shutil
+import subprocess
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import (
+    ACTIVE_MACHINE_STATUSES,
+    CONF_TIMELAPSE_INTERVAL,
+    CONF_TIMELAPSE_MODE,
+    DEFAULT_TIMELAPSE_INTERVAL,
+    DOMAIN,
+    EVENT_TIMELAPSE_FINISHED,
+    TIMELAPSE_FFMPEG_TIMEOUT,
+    TIMELAPSE_FPS,
+    TIMELAPSE_FRAME_MAX_AGE,
+    TIMELAPSE_MODE_INTERVAL,
+    TIMELAPSE_MODE_LAYER,
+    TIMELAPSE_MODE_OFF,
+)
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .data_update_coordinator import FlashForgeDataUpdateCoordinator
+    from .mjpeg import MjpegStreamHub
+    from .snapshot import PrinterSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def assemble_timelapse(frame_dir: str) -> str | None:
+    """Turn a directory of frames into a video, or a zip archive without ffmpeg."""
+    # Runs in a worker process, so only plain values are passed in and out.
+    frames_path = Path(frame_dir)
+    frames = sorted(frames_path.glob("*.jpg"))
+    if not frames:
+        shutil.rmtree(frames_path, ignore_errors=True)
+        return None
+
+    if ffmpeg := shutil.which("ffmpeg"):
+        output = frames_path.with_suffix(".mp4")
+        subprocess.run(  # noqa: S603
+            [
+                ffmpeg,
+                "-y",
+                "-loglevel",
+                "error",
+                "-framerate",
+                str(TIMELAPSE_FPS),
+                "-pattern_type",
+                "glob",
+                "-i",
+                str(frames_path / "*.jpg"),
+                "-c:v",
+                "libx264",
+                "-pix_fmt",
+                "yuv420p",
+                str(output),
+            ],
+            check=True,
+            capture_output=True,
+            timeout=TIMELAPSE_FFMPEG_TIMEOUT,
+        )
+    else:
+        output = frames_path.with_suffix(".zip")
+        # The frames are already compressed, storing them is enough.
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_STORED) as archive:
+            for frame in frames:
+                archive.write(frame, frame.name)
+
+    shutil.rmtree(frames_path)
+    return str(output)
+
+
+class TimelapseRecorder:
+    """Capture a frame per layer or per interval while the printer is printing."""
+
+    # Frames are taken from the camera stream hub, so the live view and the
+    # timelapse share one camera connection, and are written to disk as soon
+    # as they arrive. When the print ends the frames are assembled in a worker
+    # process, encoding a video would otherwise stall Home Assistant.
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: FlashForgeDataUpdateCoordinator,
+        hub: MjpegStreamHub,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._hub = hub
+        options = coordinator.config_entry.options
+        self.mode = options.get(CONF_TIMELAPSE_MODE, TIMELAPSE_MODE_OFF)
+        self.interval = options.get(CONF_TIMELAPSE_INTERVAL, DEFAULT_TIMELAPSE_INTERVAL)
+        self.frame_dir: Path | None = None
+        self.frame_count = 0
+        self._last_layer: str | None = None
+        self._writes: set[asyncio.Task[None]] = set()
+        self._pool: ProcessPoolExecutor | None = None
+        self._unsub_listener: CALLBACK_TYPE | None = None
+        self._unsub_interval: CALLBACK_TYPE | None = None
+
+    @property
+    def recording(self) -> bool:
+        """Return True if a timelapse is being recorded."""
+        return self.frame_dir is not None
+
+    @callback
+    def async_start(self) -> None:
+        """Start following the print status."""
+        if self.mode == TIMELAPSE_MODE_OFF:
+            return
+        self._unsub_listener = self.coordinator.async_add_listener(
+            self._handle_coordinator_update
+        )
+
+    async def async_stop(self) -> None:
+        """Stop recording, frames already written are left on disk."""
+        if self._unsub_listener is not None:
+            self._unsub_listener()
+            self._unsub_listener = None
+        self._stop_interval()
+        self.frame_dir = None
+        if self._writes:
+            await asyncio.wait(self._writes)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Start, continue or finish a recording."""
+        data = self.coordinator.data
+        if not self.coordinator.last_update_success or data is None:
+            return
+        printing = data.machine_status in ACTIVE_MACHINE_STATUSES
+        if printing and not self.recording:
+            self._begin(data)
+        elif not printing and self.recording:
+            self._finish()
+        elif (
+            printing
+            and self.mode == TIMELAPSE_MODE_LAYER
+            and data.print_layer != self._last_layer
+        ):
+            self._last_layer = data.print_layer
+            self._capture()
+
+    def _begin(self, data: PrinterSnapshot) -> None:
+        """Start recording a new print."""
+        name = dt_util.now().strftime("%Y%m%d-%H%M%S")
+        if job := slugify(Path(data.job_file or "").stem):
+            name = f"{name}-{job}"
+        self.frame_dir = self._base_dir() / name
+        self.frame_count = 0
+        self._last_layer = data.print_layer
+        _LOGGER.debug("Recording timelapse to %s", self.frame_dir)
+        if self.mode == TIMELAPSE_MODE_INTERVAL:
+            self._unsub_interval = async_track_time_interval(
+                self.hass,
+                self._async_interval_capture,
+                timedelta(seconds=self.interval),
+                name="FlashForge timelapse",
+            )
+        self._capture()
+
+    def _finish(self) -> None:
+        """Stop recording and assemble the frames in the background."""
+        frame_dir, self.frame_dir = self.frame_dir, None
+        self._stop_interval()
+        self.hass.async_create_background_task(
+            self._async_assemble(frame_dir, self.frame_count, set(self._writes)),
+            name="FlashForge timelapse assemble",
+        )
+
+    def _stop_interval(self) -> None:
+        """Stop the interval capture timer."""
+        if self._unsub_interval is not None:
+            self._unsub_interval()
+            self._unsub_interval = None
+
+    def _base_dir(self) -> Path:
+        """Return the directory timelapses of this printer are stored in."""
+        media = self.hass.config.media_dirs.get("local") or self.hass.config.path(
+            "media"
+        )
+        entry = self.coordinator.config_entry
+        return Path(media, DOMAIN, "timelapse", entry.unique_id or entry.entry_id)
+
+    @callback
+    def _async_interval_capture(self, _: datetime) -> None:
+        """Capture a frame on the interval timer."""
+        self._capture()
+
+    def _capture(self) -> None:
+        """Capture the next frame in the background."""
+        # Number the frame now so frames stay in order if writes finish late.
+        path = self.frame_dir / f"{self.frame_count:06d}.jpg"
+        self.frame_count += 1
+        task = self.hass.async_create_background_task(
+            self._async_capture(path), name="FlashForge timelapse frame"
+        )
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _async_capture(self, path: Path) -> None:
+        """Get a frame from the camera and write it to disk."""
+        frame = await self._hub.async_get_frame(TIMELAPSE_FRAME_MAX_AGE)
+        if frame is None:
+            _LOGGER.debug("No camera frame for timelapse %s", path)
+            return
+        try:
+            await self.hass.async_add_executor_job(self._write, path, frame)
+        except OSError as err:
+            _LOGGER.warning("Unable to write timelapse frame %s: %s", path, err)
+
+    @staticmethod
+    def _write(path: Path, frame: bytes) -> None:
+        """Write a frame, creating the directory for the first one."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(frame)
+
+    async def _async_assemble(
+        self, frame_dir: Path, frames: int, writes: set[asyncio.Task[None]]
+    ) -> None:
+        """Wait for the last frames and assemble them in a worker process."""
+        if writes:
+            await asyncio.wait(writes)
+        if self._pool is None:
+            # Spawned so the worker doesn't inherit the threads of Home Assistant.
+            self._pool = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            )
+        try:
+            # Submitting may start the worker process, keep that off the loop.
+            future = await self.hass.async_add_executor_job(
+                self._pool.submit, assemble_timelapse, str(frame_dir)
+            )
+            output = await asyncio.wrap_future(future)
+        # RuntimeError: the pool broke or was shut down when the entry unloaded.
+        except (OSError, subprocess.SubprocessError, RuntimeError) as err:
+            _LOGGER.warning("Unable to assemble timelapse %s: %s", frame_dir, err)
+            return
+        if output is None:
+            return
+        _LOGGER.debug("Timelapse saved to %s", output)
+        self.hass.bus.async_fire(
+            EVENT_TIMELAPSE_FINISHED,
+            {
+                "entry_id": self.coordinator.config_entry.entry_id,
+                "path": output,
+                "frames": frames,
+            },
+        )
@@ -0,0 +1 @@
+"""Benchmarks for the Flashforge integration."""
@@ -0,0 +1,89 @@
+"""Micro-benchmark of the MJPEG frame parser."""
+
+# Run with: python -m tests.benchmarks.mjpeg_benchmark
+
+import timeit
+
+from custom_components.flashforge.camera import extract_image_from_mjpeg
+from custom_components.flashforge.mjpeg import MjpegFrameParser
+
+CHUNK_SIZE = 1024
+FRAME_SIZE = 512 * 1024
+FRAMES = 10
+
+
+def legacy_extract_image_from_mjpeg(stream):  # noqa: ANN001, ANN201
+    """Frame extraction as done before MjpegFrameParser, kept for comparison."""
+    data = b""
+
+    for chunk in stream:
+        data += chunk
+        jpg_end = data.find(b"\xff\xd9")
+
+        if jpg_end == -1:
+            continue
+
+        jpg_start = data.find(b"\xff\xd8")
+
+        if jpg_start == -1:
+            continue
+
+        return data[jpg_start : jpg_end + 2]
+    return data
+
+
+def make_frame(size: int) -> bytes:
+    """Return a fake JPEG of about size bytes without markers in its body."""
+    return b"\xff\xd8" + b"\x00\x11" * ((size - 4) // 2) + b"\xff\xd9"
+
+
+def make_stream(frame: bytes, frames: int) -> bytes:
+    """Return a multipart MJPEG stream like the printer camera sends."""
+    part = (
+        b"--boundarydonotcross\r\nContent-Type: image/jpeg\r\n"
+        b"Content-Length: %d\r\n\r\n%s\r\n" % (len(frame), frame)
+    )
+    return part * frames
+
+
+def chunks(data: bytes, size: int = CHUNK_SIZE) -> list[bytes]:
+    """Split data in chunks as read from the socket."""
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def parse_all(stream_chunks: list[bytes], boundary: bytes | None = None) -> int:
+    """Parse all frames of a stream and return the number of frames."""
+    parser = MjpegFrameParser(boundary)
+    return sum(len(parser.feed(chunk)) for chunk in stream_chunks)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    frame = make_frame(FRAME_SIZE)
+    first_frame = chunks(make_stream(frame, 1))
+    stream = chunks(make_stream(frame, FRAMES))
+
+    assert legacy_extract_image_from_mjpeg(first_frame) == frame  # noqa: S101
+    assert extract_image_from_mjpeg(first_frame) == frame  # noqa: S101
+    assert parse_all(stream, b"boundarydonotcross") == FRAMES  # noqa: S101
+
+    results = {
+        "legacy first frame": timeit.repeat(
+            lambda: legacy_extract_image_from_mjpeg(first_frame), number=5, repeat=3
+        ),
+        "parser first frame": timeit.repeat(
+            lambda: extract_image_from_mjpeg(first_frame), number=5, repeat=3
+        ),
+        f"parser {FRAMES} frames, markers": timeit.repeat(
+            lambda: parse_all(stream), number=5, repeat=3
+        ),
+        f"parser {FRAMES} frames, content-length": timeit.repeat(
+            lambda: parse_all(stream, b"boundarydonotcross"), number=5, repeat=3
+        ),
+    }
+    for name, times in results.items():
+        print(f"{name:<36} {min(times) / 5 * 1000:8.2f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 from custom_components.flashforge.const import DOMAIN
 
 from .const_response import (
+    CAMERA_URL,
+    FILE_NAMES,
     MACHINE_INFO,
     PROGRESS_PRINTING,
     PROGRESS_READY,
@@ -39,6 +41,9 @@ def mock_printer_network() -> MagicMock:
             [PROGRESS_READY, PROGRESS_READY, PROGRESS_PRINTING]
         )
 
+        network.sendGetFileNames.return_value = FILE_NAMES
+        network.getCameraStream.return_value = CAMERA_URL
+
         yield network
 
 
@@ -45,3 +45,21 @@ STATUS_PRINTING = (
     "CurrentFile: RussianDollMazeModels.gx\r\n"
     "ok\r\n"
 )
+
+# GetFileNames (already split by ffpp)
+FILE_NAMES = [
+    "/data/Apos_PLA_14m16s.gcode",
+    "/data/RussianDollMazeModels.gx",
+]
+
+# Camera
+CAMERA_URL = "http://127.0.0.1:8080/?action=stream"
+JPEG_FRAME = b"\xff\xd8\xff\xe0JFIF-frame-data\xff\xd9"
+MJPEG_STREAM = (
+    b"--boundarydonotcross\r\n"
+    b"Content-Type: image/jpeg\r\n"
+    b"Content-Length: 21\r\n\r\n" + JPEG_FRAME + b"\r\n"
+    b"--boundarydonotcross\r\n"
+    b"Content-Type: image/jpeg\r\n"
+    b"Content-Length: 21\r\n\r\n" + JPEG_FRAME + b"\r\n"
+)
@@ -0,0 +1,236 @@
+"""Tests for the Flashforge camera."""
+
+import asyncio
+import contextlib
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from custom_components.flashforge.camera import extract_image_from_mjpeg
+from custom_components.flashforge.mjpeg import (
+    MjpegFrameParser,
+    MjpegStreamHub,
+    ScaledFrameCache,
+    parse_boundary,
+)
+
+from . import init_integration
+from .const_response import CAMERA_URL, JPEG_FRAME, MJPEG_STREAM
+
+CAMERA_ENTITY = "camera.camera"
+
+
+class FakeUpstream:
+    """Camera connection that streams the chunks put into it."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.chunks: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self.connections = 0
+
+    @contextlib.asynccontextmanager
+    async def get(self, *_, **__):
+        """Open a connection."""
+        self.connections += 1
+        response = MagicMock()
+        response.headers = {}
+        response.content.iter_chunked = self._iter_chunked
+        yield response
+
+    async def _iter_chunked(self, _):
+        while (chunk := await self.chunks.get()) is not None:
+            yield chunk
+
+
+def test_parser_markers():
+    """Test that frames are found by SOI/EOI markers fed in small chunks."""
+    parser = MjpegFrameParser()
+    frames = []
+    for i in range(0, len(MJPEG_STREAM), 5):
+        frames += parser.feed(MJPEG_STREAM[i : i + 5])
+
+    assert frames == [JPEG_FRAME, JPEG_FRAME]
+
+
+def test_parser_content_length():
+    """Test that Content-Length is used when the stream has a boundary."""
+    # A JPEG with an embedded thumbnail has an EOI marker before its end.
+    frame = b"\xff\xd8thumb\xff\xd8\xff\xd9data\xff\xd9"
+    part = b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n%s\r\n"
+    stream = part % (len(frame), frame) * 3
+    parser = MjpegFrameParser(
+        parse_boundary("multipart/x-mixed-replace;boundary=frame")
+    )
+
+    frames = []
+    for i in range(0, len(stream), 7):
+        frames += parser.feed(stream[i : i + 7])
+
+    assert frames == [frame] * 3
+
+
+def test_parser_eoi_before_soi():
+    """Test that an EOI before the first SOI is not returned as a frame."""
+    stream = [b"garbage\xff\xd9more", b"\xff\xd8jpeg", b"\xff\xd9"]
+
+    assert extract_image_from_mjpeg(stream) == b"\xff\xd8jpeg\xff\xd9"
+
+
+def test_parse_boundary():
+    """Test boundary parsing from the Content-Type header."""
+    assert (
+        parse_boundary('multipart/x-mixed-replace; boundary="boundarydonotcross"')
+        == b"boundarydonotcross"
+    )
+    assert parse_boundary("image/jpeg") is None
+    assert parse_boundary(None) is None
+
+
+@pytest.mark.asyncio
+async def test_hub_shares_upstream(hass: HomeAssistant):
+    """Test that many viewers share one upstream connection."""
+    upstream = FakeUpstream()
+    hub = MjpegStreamHub(hass, CAMERA_URL)
+
+    with patch(
+        "custom_components.flashforge.mjpeg.async_get_clientsession",
+        return_value=upstream,
+    ):
+        async with hub.async_subscribe() as viewer1, hub.async_subscribe() as viewer2:
+            await upstream.chunks.put(MJPEG_STREAM)
+            assert await viewer1.get() == JPEG_FRAME
+            assert await viewer2.get() == JPEG_FRAME
+            assert hub.viewers == 2
+            assert hub.is_streaming
+
+        # Upstream is closed when the last viewer leaves.
+        assert not hub.is_streaming
+
+    assert upstream.connections == 1
+    assert hub.latest_frame == JPEG_FRAME
+    assert hub.frame_seq == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_viewer_drops_frames(hass: HomeAssistant):
+    """Test that a viewer that doesn't read only keeps the newest frames."""
+    upstream = FakeUpstream()
+    hub = MjpegStreamHub(hass, CAMERA_URL)
+
+    with patch(
+        "custom_components.flashforge.mjpeg.async_get_clientsession",
+        return_value=upstream,
+    ):
+        async with hub.async_subscribe() as viewer:
+            for _ in range(10):
+                await upstream.chunks.put(MJPEG_STREAM)
+            await upstream.chunks.put(None)
+            await asyncio.sleep(0.01)
+
+            assert hub.frame_seq == 20
+            # Two newest frames and the end of stream.
+            assert viewer.qsize() == 3
+            assert await viewer.get() == JPEG_FRAME
+            assert await viewer.get() == JPEG_FRAME
+            # The stream ended.
+            assert await viewer.get() is None
+
+
+@pytest.mark.asyncio
+async def test_mjpeg_stream(
+    enable_custom_integrations,
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    aioclient_mock: AiohttpClientMocker,
+    mock_printer_network: MagicMock,
+):
+    """Test that the camera proxies frames from the printer."""
+    aioclient_mock.get(CAMERA_URL, content=MJPEG_STREAM)
+    await init_integration(hass)
+
+    client = await hass_client()
+    response = await client.get(f"/api/camera_proxy_stream/{CAMERA_ENTITY}")
+
+    assert response.status == 200
+    body = await response.read()
+    assert body.count(JPEG_FRAME) == 2
+    assert aioclient_mock.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_snapshot_from_live_stream(hass: HomeAssistant):
+    """Test that a snapshot is served from the live stream."""
+    upstream = FakeUpstream()
+    hub = MjpegStreamHub(hass, CAMERA_URL)
+
+    with patch(
+        "custom_components.flashforge.mjpeg.async_get_clientsession",
+        return_value=upstream,
+    ):
+        async with hub.async_subscribe() as viewer:
+            await upstream.chunks.put(MJPEG_STREAM)
+            await viewer.get()
+
+            assert await hub.async_get_frame(max_age=60) == JPEG_FRAME
+
+    assert upstream.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_camera_image(
+    enable_custom_integrations,
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    aioclient_mock: AiohttpClientMocker,
+    mock_printer_network: MagicMock,
+):
+    """Test that a snapshot opens a short lived connection when not streaming."""
+    aioclient_mock.get(CAMERA_URL, content=MJPEG_STREAM)
+    await init_integration(hass)
+
+    client = await hass_client()
+    response = await client.get(f"/api/camera_proxy/{CAMERA_ENTITY}")
+    assert response.status == 200
+    assert await response.read() == JPEG_FRAME
+    assert aioclient_mock.call_count == 1
+
+    # Next snapshot within max age is served from the cache.
+    response = await client.get(f"/api/camera_proxy/{CAMERA_ENTITY}")
+    assert await response.read() == JPEG_FRAME
+    assert aioclient_mock.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_scaled_frames_cached(hass: HomeAssistant):
+    """Test that a frame is only scaled once per size."""
+    cache = ScaledFrameCache(hass, size=2)
+
+    with patch(
+        "custom_components.flashforge.mjpeg.scale_jpeg_camera_image",
+        side_effect=lambda image, width, height: b"%dx%d" % (width, height),
+    ) as scale:
+        results = await asyncio.gather(
+            cache.async_scale(1, JPEG_FRAME, 320, 240),
+            cache.async_scale(1, JPEG_FRAME, 320, 240),
+        )
+        assert results == [b"320x240", b"320x240"]
+        assert scale.call_count == 1
+
+        assert await cache.async_scale(1, JPEG_FRAME, 160, 120) == b"160x120"
+        assert await cache.async_scale(1, JPEG_FRAME, 320, 240) == b"320x240"
+        assert scale.call_count == 2
+
+        # Oldest size is evicted when the cache is full.
+        await cache.async_scale(2, JPEG_FRAME, 320, 240)
+        await cache.async_scale(1, JPEG_FRAME, 160, 120)
+        assert scale.call_count == 4
+
+        # Frames without sequence number are never cached.
+        await cache.async_scale(None, JPEG_FRAME, 320, 240)
+        await cache.async_scale(None, JPEG_FRAME, 320, 240)
+        assert scale.call_count == 6
@@ -1,6 +1,6 @@
 """Tests for the Flashforge config flow."""
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 from homeassistant import config_entries
@@ -9,7 +9,18 @@ from homeassistant.const import CONF_IP_ADDRESS, CONF_PORT, CONF_SOURCE
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
-from custom_components.flashforge.const import CONF_SERIAL_NUMBER, DOMAIN
+from custom_components.flashforge.const import (
+    CONF_ATTEMPT_TIMEOUT,
+    CONF_FAILURE_THRESHOLD,
+    CONF_PRINTERS,
+    CONF_PROBE_INTERVAL,
+    CONF_RETRY_ATTEMPTS,
+    CONF_RETRY_BACKOFF,
+    CONF_SERIAL_NUMBER,
+    DOMAIN,
+    MAX_FAILED_UPDATES,
+)
+from custom_components.flashforge.discovery import DiscoveredPrinter
 
 from . import get_schema_default, get_schema_suggested, init_integration
 
@@ -129,6 +140,111 @@ async def test_auto_discover_device_error(
     assert result["type"] == FlowResultType.ABORT
 
 
+@pytest.mark.asyncio
+async def test_auto_discover_many_printers(
+    enable_custom_integrations,
+    hass: HomeAssistant,
+    mock_printer_network: MagicMock,
+    mock_printer_discovery: MagicMock,
+):
+    """Test that all discovered printers are offered and configured ones skipped."""
+    await init_integration(hass)
+    mock_printer_discovery.return_value = [
+        ("Adventurer4", "127.0.0.1"),
+        ("Adventurer4", "192.168.0.64"),
+        ("Adventurer4", "192.168.0.65"),
+        ("Adventurer4", "192.168.0.66"),
+    ]
+    printers = {
+        "192.168.0.64": DiscoveredPrinter("192.168.0.64", 8899, "SN64", "B"),
+        "192.168.0.65": DiscoveredPrinter("192.168.0.65", 8899, "SN65", "C"),
+        "192.168.0.66": None,
+    }
+
+    async def query(ip_address):
+        return printers[ip_address]
+
+    with patch(
+        "custom_components.flashforge.discovery.async_query_printer",
+        side_effect=query,
+    ) as query_printer:
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={CONF_SOURCE: config_entries.SOURCE_USER}, data={}
+        )
+
+    # The loaded printer on 127.0.0.1 is not asked for its machine info.
+    assert query_printer.call_count == 3
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "pick"
+    assert get_schema_default(result["data_schema"].schema, CONF_PRINTERS) == [
+        "SN64",
+        "SN65",
+    ]
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={CONF_PRINTERS: []}
+    )
+    assert result["errors"] == {"base": "no_printers_selected"}
+
+    # The printer not selected is offered as a discovered printer.
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={CONF_PRINTERS: ["SN64"]}
+    )
+    await hass.async_block_till_done()
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_IP_ADDRESS] == "192.168.0.64"
+    assert result["data"][CONF_SERIAL_NUMBER] == "SN64"
+    progress = hass.config_entries.flow.async_progress()
+    assert len(progress) == 1
+    assert (
+        progress[0]["context"]["source"] == config_entries.SOURCE_INTEGRATION_DISCOVERY
+    )
+    assert progress[0]["context"]["unique_id"] == "SN65"
+
+    result = await hass.config_entries.flow.async_configure(
+        progress[0]["flow_id"], user_input={}
+    )
+    await hass.async_block_till_done()
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["title"] == "C"
+    assert len(hass.config_entries.async_entries(DOMAIN)) == 3
+
+
+@pytest.mark.asyncio
+async def test_auto_discover_bulk_add(
+    enable_custom_integrations,
+    hass: HomeAssistant,
+    mock_printer_network: MagicMock,
+    mock_printer_discovery: MagicMock,
+):
+    """Test that all selected printers are added at once."""
+    printers = [
+        DiscoveredPrinter(f"192.168.0.{i}", 8899, f"SN{i}", f"Printer {i}")
+        for i in range(3)
+    ]
+    mock_printer_discovery.return_value = [("", p.ip_address) for p in printers]
+
+    with patch(
+        "custom_components.flashforge.discovery.async_query_printer",
+        side_effect=printers,
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={CONF_SOURCE: config_entries.SOURCE_USER}, data={}
+        )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={CONF_PRINTERS: ["SN0", "SN1", "SN2"]}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert not hass.config_entries.flow.async_progress()
+    assert sorted(e.unique_id for e in hass.config_entries.async_entries(DOMAIN)) == [
+        "SN0",
+        "SN1",
+        "SN2",
+    ]
+
+
 @pytest.mark.asyncio
 async def test_connection_timeout(
     enable_custom_integrations, hass: HomeAssistant, mock_printer_network: MagicMock
@@ -206,13 +322,50 @@ async def test_printer_not_responding(
     enable_custom_integrations,  # type: ignore
     hass: HomeAssistant,
     mock_printer_network: MagicMock,
+    mock_printer_discovery: MagicMock,
 ):
     """Test if printer not responding during setup."""
     mock_printer_network.connect.side_effect = ConnectionError("conn_error")
     entry = await init_integration(hass)
 
     assert entry.state is ConfigEntryState.SETUP_RETRY
+    # The printer is searched for on the network.
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert mock_printer_discovery.called
 
     mock_printer_network.connect.side_effect = TimeoutError("timeout")
     entry = await init_integration(hass)
     assert entry.state is ConfigEntryState.SETUP_RETRY
+
+
+@pytest.mark.asyncio
+async def test_options_flow(
+    enable_custom_integrations, hass: HomeAssistant, mock_printer_network: MagicMock
+):
+    """Test that the retry policy can be changed through the options flow."""
+    entry = await init_integration(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+    schema = result["data_schema"].schema
+    assert get_schema_default(schema, CONF_RETRY_ATTEMPTS) == MAX_FAILED_UPDATES
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_RETRY_ATTEMPTS: 5,
+            CONF_ATTEMPT_TIMEOUT: 4,
+            CONF_RETRY_BACKOFF: 1,
+            CONF_FAILURE_THRESHOLD: 2,
+            CONF_PROBE_INTERVAL: 120,
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_RETRY_ATTEMPTS] == 5
+    # Entry is reloaded with the new policy.
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.retry_policy.attempts == 5
+    assert coordinator.retry_policy.probe_interval == 120
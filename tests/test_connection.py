@@ -0,0 +1,91 @@
+"""Tests for the Flashforge printer connection."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.flashforge.connection import (
+    PRIORITY_ACTION,
+    PRIORITY_POLL,
+    PrinterConnection,
+)
+
+
+def mock_printer() -> MagicMock:
+    """Return a printer with a network that can be disconnected."""
+    printer = MagicMock()
+    printer.network.disconnect = AsyncMock()
+    return printer
+
+
+@pytest.mark.asyncio
+async def test_actions_sent_before_polls(hass: HomeAssistant):
+    """Test that queued user actions are sent ahead of queued polls."""
+    connection = PrinterConnection(hass, mock_printer())
+    sent = []
+    blocker = asyncio.Event()
+
+    async def command(name: str, disconnect: bool) -> str:  # noqa: ARG001
+        if name == "first":
+            await blocker.wait()
+        sent.append(name)
+        return name
+
+    first = hass.async_create_task(connection.async_request(command, "first"))
+    await asyncio.sleep(0)
+    poll = hass.async_create_task(
+        connection.async_request(command, "poll", priority=PRIORITY_POLL)
+    )
+    action = hass.async_create_task(
+        connection.async_request(command, "action", priority=PRIORITY_ACTION)
+    )
+    await asyncio.sleep(0)
+    blocker.set()
+
+    assert await asyncio.gather(first, poll, action) == ["first", "poll", "action"]
+    assert sent == ["first", "action", "poll"]
+    await connection.async_close()
+
+
+@pytest.mark.asyncio
+async def test_identical_reads_coalesced(hass: HomeAssistant):
+    """Test that an identical read in flight is only sent once."""
+    connection = PrinterConnection(hass, mock_printer())
+    calls = 0
+
+    async def read_status(disconnect: bool) -> str:  # noqa: ARG001
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return "status"
+
+    results = await asyncio.gather(
+        *(connection.async_request(read_status, coalesce=True) for _ in range(3))
+    )
+
+    assert results == ["status"] * 3
+    assert calls == 1
+    stats = connection.as_dict()["commands"]["read_status"]
+    assert stats["count"] == 1
+    assert stats["coalesced"] == 2
+    await connection.async_close()
+
+
+@pytest.mark.asyncio
+async def test_command_timeout_drops_session(hass: HomeAssistant):
+    """Test that a hanging command times out and the session is closed."""
+    printer = mock_printer()
+    connection = PrinterConnection(hass, printer)
+
+    async def hang(disconnect: bool) -> None:  # noqa: ARG001
+        await asyncio.Event().wait()
+
+    with pytest.raises(TimeoutError):
+        await connection.async_request(hang, command_timeout=0.01)
+
+    printer.network.disconnect.assert_awaited()
+    assert not connection.connected
+    assert connection.as_dict()["commands"]["hang"]["errors"] == 1
+    await connection.async_close()
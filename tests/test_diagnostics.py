@@ -0,0 +1,33 @@
+"""Tests for the Flashforge diagnostics."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.components.diagnostics import (
+    get_diagnostics_for_config_entry,
+)
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from . import init_integration
+
+
+@pytest.mark.asyncio
+async def test_entry_diagnostics(
+    enable_custom_integrations,
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    mock_printer_network: MagicMock,
+):
+    """Test config entry diagnostics."""
+    entry = await init_integration(hass)
+
+    result = await get_diagnostics_for_config_entry(hass, hass_client, entry)
+
+    assert result["entry"]["unique_id"] == REDACTED
+    assert result["printer"]["serial"] == REDACTED
+    assert result["printer"]["machine_type"] == "Flashforge Adventurer 4"
+    assert result["coordinator"]["last_update_success"] is True
+    assert result["retry"]["policy"]["attempts"] == 3
+    assert result["retry"]["breaker"]["state"] == "closed"
@@ -0,0 +1,88 @@
+"""Tests for the Flashforge background discovery."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_IP_ADDRESS
+from homeassistant.core import HomeAssistant
+
+from custom_components.flashforge.discovery import (
+    DiscoveredPrinter,
+    DiscoveryScanner,
+    async_get_scanner,
+)
+
+from . import init_integration
+
+
+@pytest.mark.asyncio
+async def test_printer_moved(
+    enable_custom_integrations,
+    hass: HomeAssistant,
+    mock_printer_network: MagicMock,
+    mock_printer_discovery: MagicMock,
+):
+    """Test that an entry follows its printer to a new address."""
+    mock_printer_network.connect.side_effect = ConnectionError("conn_error")
+    moved = DiscoveredPrinter("192.168.0.64", 8899, "SNADVA1234567", "Adventurer4")
+    scans: list[asyncio.Task[None]] = []
+    request_scan = DiscoveryScanner.async_request_scan
+
+    def capture_scan(scanner: DiscoveryScanner) -> asyncio.Task[None]:
+        scans.append(task := request_scan(scanner))
+        return task
+
+    with (
+        patch(
+            "custom_components.flashforge.discovery.async_query_printer",
+            return_value=moved,
+        ) as query_printer,
+        patch.object(DiscoveryScanner, "async_request_scan", capture_scan),
+    ):
+        entry = await init_integration(hass)
+        assert entry.state is ConfigEntryState.SETUP_RETRY
+
+        # The failed setup started a scan that found the printer, the entry
+        # is updated and reloaded.
+        mock_printer_network.connect.side_effect = None
+        await asyncio.gather(*scans)
+        await hass.async_block_till_done()
+
+        assert query_printer.call_args.args == ("192.168.0.64",)
+        assert entry.data[CONF_IP_ADDRESS] == "192.168.0.64"
+        assert entry.state is ConfigEntryState.LOADED
+        scanner = async_get_scanner(hass)
+        assert scanner.known == {"SNADVA1234567": "192.168.0.64"}
+
+        # A loaded printer is not asked again.
+        query_printer.reset_mock()
+        await scanner.async_scan()
+        assert not query_printer.called
+
+
+@pytest.mark.asyncio
+async def test_scanner_stopped_with_last_entry(
+    enable_custom_integrations,
+    hass: HomeAssistant,
+    mock_printer_network: MagicMock,
+    mock_printer_discovery: MagicMock,
+):
+    """Test that the scanner only runs while a printer is loaded."""
+    scanner = async_get_scanner(hass)
+    mock_printer_network.connect.side_effect = ConnectionError("conn_error")
+    entry = await init_integration(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+    assert not scanner.scanning
+
+    mock_printer_network.connect.side_effect = None
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+    assert scanner.scanning
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert not scanner.scanning
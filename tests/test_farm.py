@@ -0,0 +1,144 @@
+"""Tests for the Flashforge printer farm."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_IP_ADDRESS, CONF_PORT
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.flashforge.const import CONF_SERIAL_NUMBER, DOMAIN
+from custom_components.flashforge.farm import FlashForgeFarm
+from custom_components.flashforge.retry import RetryPolicy
+
+from . import init_integration
+from .const_response import PROGRESS_PRINTING, STATUS_PRINTING, TEMP_PRINTING
+
+
+@pytest.mark.asyncio
+async def test_poll_gate(hass: HomeAssistant):
+    """Test that polls are spaced out and limited in number."""
+    with (
+        patch("custom_components.flashforge.farm.FARM_POLL_SPACING", 0.02),
+        patch("custom_components.flashforge.farm.FARM_MAX_CONCURRENT_POLLS", 2),
+    ):
+        farm = FlashForgeFarm(hass)
+        farm.coordinators = {"a": MagicMock(), "b": MagicMock(), "c": MagicMock()}
+        starts = []
+        max_in_flight = 0
+
+        async def poll() -> None:
+            nonlocal max_in_flight
+            starts.append(time.monotonic())
+            max_in_flight = max(max_in_flight, farm.in_flight)
+            await asyncio.sleep(0.1)
+
+        await asyncio.gather(*(farm.async_poll(poll) for _ in range(4)))
+
+    starts.sort()
+    assert all(b - a >= 0.015 for a, b in zip(starts, starts[1:], strict=False))
+    assert max_in_flight == 2
+    assert farm.stats.count == 4
+    assert farm.stats.errors == 0
+
+
+@pytest.mark.asyncio
+async def test_slot_released_between_attempts(hass: HomeAssistant):
+    """Test that a retried poll doesn't hold the farm while backing off."""
+    with patch("custom_components.flashforge.farm.FARM_MAX_CONCURRENT_POLLS", 1):
+        farm = FlashForgeFarm(hass)
+    policy = RetryPolicy(attempts=2, backoff=0.2, max_backoff=0.2)
+    failing = MagicMock(side_effect=ConnectionError("offline"))
+
+    async def fail() -> None:
+        failing()
+
+    async def poll() -> None:
+        # The slot is free while the failing poll waits for its retry.
+        await asyncio.sleep(0.01)
+        assert farm.in_flight == 0
+        async with farm.async_slot():
+            pass
+
+    with pytest.raises(ConnectionError):
+        await asyncio.gather(policy.async_call(fail, gate=farm.async_slot), poll())
+
+    assert failing.call_count == 2
+    assert farm.stats.count == 3
+    assert farm.stats.errors == 2
+
+
+@pytest.mark.asyncio
+async def test_farm_sensors(
+    enable_custom_integrations, hass: HomeAssistant, mock_printer_network: MagicMock
+):
+    """Test that farm sensors summarize all printers and move between hosts."""
+    mock_printer_network.sendStatusRequest.side_effect = None
+    mock_printer_network.sendStatusRequest.return_value = STATUS_PRINTING
+    mock_printer_network.sendTempRequest.side_effect = None
+    mock_printer_network.sendTempRequest.return_value = TEMP_PRINTING
+    mock_printer_network.sendProgressRequest.side_effect = None
+    mock_printer_network.sendProgressRequest.return_value = PROGRESS_PRINTING
+
+    first = await init_integration(hass)
+    second = MockConfigEntry(
+        title="Adventurer5",
+        domain=DOMAIN,
+        unique_id="SNADVA7654321",
+        data={
+            CONF_IP_ADDRESS: "127.0.0.2",
+            CONF_PORT: 8899,
+            CONF_SERIAL_NUMBER: "SNADVA7654321",
+        },
+    )
+    second.add_to_hass(hass)
+    await hass.config_entries.async_setup(second.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.flashforge_farm_printing").state == "2"
+    assert hass.states.get("sensor.flashforge_farm_idle").state == "0"
+    assert hass.states.get("sensor.flashforge_farm_offline").state == "0"
+    assert hass.states.get("sensor.flashforge_farm_progress").state == "11.0"
+
+    # The second entry takes over the farm sensors.
+    await hass.config_entries.async_unload(first.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.flashforge_farm_printing").state == "1"
+    farm = hass.data[DOMAIN][second.entry_id].farm
+    assert farm.host_entry_id == second.entry_id
+
+
+@pytest.mark.asyncio
+async def test_printer_down_at_startup_counted_offline(
+    enable_custom_integrations,
+    hass: HomeAssistant,
+    mock_printer_network: MagicMock,
+    mock_printer_discovery: MagicMock,
+):
+    """Test that a printer that never set up is counted as offline."""
+    await init_integration(hass)
+    down = MockConfigEntry(
+        title="Adventurer5",
+        domain=DOMAIN,
+        unique_id="SNADVA7654321",
+        data={
+            CONF_IP_ADDRESS: "127.0.0.2",
+            CONF_PORT: 8899,
+            CONF_SERIAL_NUMBER: "SNADVA7654321",
+        },
+    )
+    down.add_to_hass(hass)
+    mock_printer_network.connect.side_effect = ConnectionError("conn_error")
+    await hass.config_entries.async_setup(down.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert down.state is ConfigEntryState.SETUP_RETRY
+    assert hass.states.get("sensor.flashforge_farm_offline").state == "1"
+
+    await hass.config_entries.async_remove(down.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.flashforge_farm_offline").state == "0"
@@ -0,0 +1,102 @@
+"""Tests for the Flashforge services and file list."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.flashforge.const import DOMAIN
+from custom_components.flashforge.data_update_coordinator import (
+    FlashForgeDataUpdateCoordinator,
+)
+
+from . import init_integration
+
+
+@pytest.mark.asyncio
+async def test_file_list_not_polled_with_status(
+    enable_custom_integrations, hass: HomeAssistant, mock_printer_network: MagicMock
+):
+    """Test that a status update don't fetch the file list."""
+    entry = await init_integration(hass)
+    coordinator: FlashForgeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    call_count = mock_printer_network.sendGetFileNames.call_count
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert mock_printer_network.sendGetFileNames.call_count == call_count
+    state = hass.states.get("select.adventurer4_file_list")
+    assert state is not None
+    assert state.attributes["options"] == [
+        "Apos_PLA_14m16s.gcode",
+        "RussianDollMazeModels.gx",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_file_names_service(
+    enable_custom_integrations, hass: HomeAssistant, mock_printer_network: MagicMock
+):
+    """Test that the get_file_names service refresh and return the file list."""
+    await init_integration(hass)
+    mock_printer_network.sendGetFileNames.return_value = ["/data/new.gx"]
+
+    response = await hass.services.async_call(
+        DOMAIN, "get_file_names", blocking=True, return_response=True
+    )
+    await hass.async_block_till_done()
+
+    assert response == {"files": ["new.gx"]}
+    state = hass.states.get("select.adventurer4_file_list")
+    assert state.attributes["options"] == ["new.gx"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_file_list_service(
+    enable_custom_integrations, hass: HomeAssistant, mock_printer_network: MagicMock
+):
+    """Test that the refresh_file_list service updates the select options."""
+    await init_integration(hass)
+    mock_printer_network.sendGetFileNames.return_value = None
+
+    await hass.services.async_call(DOMAIN, "refresh_file_list", blocking=True)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("select.adventurer4_file_list")
+    assert state.attributes["options"] == []
+
+
+@pytest.mark.asyncio
+async def test_services_share_session(
+    enable_custom_integrations, hass: HomeAssistant, mock_printer_network: MagicMock
+):
+    """Test that actions are sent over the session kept open by the poll."""
+    await init_integration(hass)
+    mock_printer_network.disconnect.reset_mock()
+
+    await hass.services.async_call(DOMAIN, "pause", blocking=True)
+    await hass.services.async_call(DOMAIN, "continue_print", blocking=True)
+
+    mock_printer_network.sendPauseRequest.assert_called_once_with(disconnect=False)
+    mock_printer_network.sendContinueRequest.assert_called_once_with(disconnect=False)
+    mock_printer_network.disconnect.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_service_reconnects_lost_session(
+    enable_custom_integrations, hass: HomeAssistant, mock_printer_network: MagicMock
+):
+    """Test that a command is resent once if the open session was dropped."""
+    entry = await init_integration(hass)
+    coordinator: FlashForgeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.connection.connected
+    mock_printer_network.sendAbortRequest.side_effect = [
+        ConnectionError("conn_error"),
+        "CMD M26 Received.\r\n",
+    ]
+
+    await hass.services.async_call(DOMAIN, "abort", blocking=True)
+
+    assert mock_printer_network.sendAbortRequest.call_count == 2
+    assert coordinator.connection.connected
@@ -0,0 +1,69 @@
+"""Tests for the Flashforge adaptive polling scheduler."""
+
+from datetime import timedelta
+
+from ffpp.Printer import temperatures
+
+from custom_components.flashforge.const import (
+    IDLE_TIMEOUT,
+    SCAN_INTERVAL,
+    SCAN_INTERVAL_ACTIVE,
+    SCAN_INTERVAL_IDLE,
+    SCAN_INTERVAL_OFFLINE_MAX,
+)
+from custom_components.flashforge.scheduler import AdaptivePollingScheduler
+
+COLD = [temperatures("T0", 22, 0), temperatures("B", 20, 0)]
+HEATING = [temperatures("T0", 120, 210), temperatures("B", 20, 0)]
+HOT = [temperatures("T0", 209, 210), temperatures("B", 64, 64)]
+
+
+def test_printing_is_polled_fast():
+    """Test that a printing printer is polled with the active interval."""
+    scheduler = AdaptivePollingScheduler()
+    assert scheduler.online_interval("BUILDING_FROM_SD", HOT, now=0) == timedelta(
+        seconds=SCAN_INTERVAL_ACTIVE
+    )
+
+
+def test_heating_is_polled_fast():
+    """Test that a printer heating towards a target is polled fast."""
+    scheduler = AdaptivePollingScheduler()
+    assert scheduler.online_interval("READY", HEATING, now=0) == timedelta(
+        seconds=SCAN_INTERVAL_ACTIVE
+    )
+    # Temperature reached, back to normal interval.
+    assert scheduler.online_interval("READY", HOT, now=10) == timedelta(
+        seconds=SCAN_INTERVAL
+    )
+
+
+def test_idle_is_polled_slow():
+    """Test that a printer READY for a long time is polled slowly."""
+    scheduler = AdaptivePollingScheduler()
+    assert scheduler.online_interval("READY", COLD, now=0) == timedelta(
+        seconds=SCAN_INTERVAL
+    )
+    assert scheduler.online_interval("READY", COLD, now=IDLE_TIMEOUT) == timedelta(
+        seconds=SCAN_INTERVAL_IDLE
+    )
+
+    # A new print resets the idle timer.
+    scheduler.online_interval("BUILDING_FROM_SD", HOT, now=IDLE_TIMEOUT + 1)
+    assert scheduler.online_interval("READY", COLD, now=IDLE_TIMEOUT + 2) == timedelta(
+        seconds=SCAN_INTERVAL
+    )
+
+
+def test_offline_backoff():
+    """Test exponential backoff while printer is offline."""
+    scheduler = AdaptivePollingScheduler()
+    intervals = [scheduler.offline_interval().total_seconds() for _ in range(8)]
+
+    assert intervals[0] == SCAN_INTERVAL
+    assert intervals[1] == SCAN_INTERVAL * 2
+    assert intervals[-1] == SCAN_INTERVAL_OFFLINE_MAX
+
+    # Backoff is reset when the printer answers again.
+    scheduler.online_interval("READY", COLD, now=0)
+    assert scheduler.offline_interval() == timedelta(seconds=SCAN_INTERVAL)
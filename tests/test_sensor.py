@@ -1,5 +1,7 @@
 """Tests for the Flashforge sensors."""
 
+from dataclasses import FrozenInstanceError
+from datetime import timedelta
 from unittest.mock import MagicMock
 
 import pytest
@@ -8,9 +10,24 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from custom_components.flashforge.const import DOMAIN, MAX_FAILED_UPDATES
+from custom_components.flashforge.const import (
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_PROBE_INTERVAL,
+    DOMAIN,
+    MAX_FAILED_UPDATES,
+)
+from custom_components.flashforge.data_update_coordinator import (
+    FlashForgeDataUpdateCoordinator,
+)
+from custom_components.flashforge.snapshot import PrinterSnapshot, ToolTemperature
 
 from . import init_integration
+from .const_response import (
+    PROGRESS_PRINTING,
+    STATUS_PRINTING,
+    STATUS_READY,
+    TEMP_PRINTING,
+)
 
 SENSORS = (
     {
@@ -133,3 +150,84 @@ async def test_sensor_update_error2(
     for expected in SENSORS:
         state = hass.states.get(expected["entity_id"])
         assert state.state == STATE_UNAVAILABLE
+
+
+@pytest.mark.asyncio
+async def test_printer_marked_offline(
+    enable_custom_integrations, hass: HomeAssistant, mock_printer_network: MagicMock
+):
+    """Test that repeated failed updates opens the circuit breaker."""
+    entry = await init_integration(hass)
+    coordinator: FlashForgeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    mock_printer_network.sendStatusRequest.side_effect = TimeoutError("timeout")
+
+    for _ in range(DEFAULT_FAILURE_THRESHOLD):
+        await coordinator.async_refresh()
+
+    assert coordinator.breaker.is_open
+    assert coordinator.update_interval == timedelta(seconds=DEFAULT_PROBE_INTERVAL)
+
+    # An offline printer is only probed with one attempt.
+    call_count = mock_printer_network.sendStatusRequest.call_count
+    await coordinator.async_refresh()
+    assert mock_printer_network.sendStatusRequest.call_count == call_count + 1
+
+    # Printer is back online.
+    mock_printer_network.sendStatusRequest.side_effect = None
+    mock_printer_network.sendStatusRequest.return_value = STATUS_READY
+    await coordinator.async_refresh()
+    assert not coordinator.breaker.is_open
+    assert coordinator.last_update_success
+
+
+@pytest.mark.asyncio
+async def test_unchanged_values_not_written(
+    enable_custom_integrations, hass: HomeAssistant, mock_printer_network: MagicMock
+):
+    """Test that states are only written when a value changes."""
+    entry = await init_integration(hass)
+    coordinator: DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    mock_printer_network.sendStatusRequest.side_effect = None
+    mock_printer_network.sendStatusRequest.return_value = STATUS_PRINTING
+    mock_printer_network.sendProgressRequest.side_effect = None
+    mock_printer_network.sendProgressRequest.return_value = PROGRESS_PRINTING
+    mock_printer_network.sendTempRequest.side_effect = None
+    extruder = "sensor.adventurer4_extruder_current"
+    status = "sensor.adventurer4_status"
+
+    async def refresh(temp: str) -> None:
+        mock_printer_network.sendTempRequest.return_value = temp
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    await refresh(TEMP_PRINTING)
+    extruder_reported = hass.states.get(extruder).last_reported
+    status_reported = hass.states.get(status).last_reported
+
+    # Within the deadband nothing is written.
+    await refresh(TEMP_PRINTING.replace("T0:198/", "T0:198.4/"))
+    assert hass.states.get(extruder).state == "198.0"
+    assert hass.states.get(extruder).last_reported == extruder_reported
+    assert hass.states.get(status).last_reported == status_reported
+
+    # Outside the deadband the new temperature is written.
+    await refresh(TEMP_PRINTING.replace("T0:198/", "T0:199/"))
+    assert hass.states.get(extruder).state == "199.0"
+    assert hass.states.get(status).last_reported == status_reported
+
+
+@pytest.mark.asyncio
+async def test_coordinator_snapshot(
+    enable_custom_integrations, hass: HomeAssistant, mock_printer_network: MagicMock
+):
+    """Test that the coordinator returns an immutable snapshot of the printer."""
+    entry = await init_integration(hass)
+    coordinator: DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    data = coordinator.data
+
+    assert isinstance(data, PrinterSnapshot)
+    assert data.machine_status == "BUILDING_FROM_SD"
+    assert data.extruders == (ToolTemperature("t0", 198.0, 210.0),)
+    assert data.beds == (ToolTemperature("b", 48.0, 64.0),)
+    with pytest.raises(FrozenInstanceError):
+        data.machine_status = "READY"
@@ -0,0 +1,100 @@
+"""Tests for the Flashforge timelapse."""
+
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.flashforge.const import (
+    CONF_TIMELAPSE_MODE,
+    EVENT_TIMELAPSE_FINISHED,
+    TIMELAPSE_MODE_LAYER,
+)
+from custom_components.flashforge.snapshot import PrinterSnapshot
+from custom_components.flashforge.timelapse import (
+    TimelapseRecorder,
+    assemble_timelapse,
+)
+
+from . import init_integration
+from .const_response import JPEG_FRAME
+
+PRINTING = PrinterSnapshot(
+    machine_status="BUILDING_FROM_SD",
+    move_mode="MOVING",
+    status="S:1 L:0 J:0 F:0",
+    led=True,
+    job_file="cube.gx",
+    print_percent="11",
+    print_layer="1",
+    job_layers="100",
+    extruders=(),
+    beds=(),
+)
+
+
+def test_assemble_zip(tmp_path):
+    """Test that frames are stored in a zip archive when ffmpeg is missing."""
+    frame_dir = tmp_path / "print"
+    frame_dir.mkdir()
+    for i in range(3):
+        (frame_dir / f"{i:06d}.jpg").write_bytes(JPEG_FRAME)
+
+    with patch(
+        "custom_components.flashforge.timelapse.shutil.which", return_value=None
+    ):
+        output = assemble_timelapse(str(frame_dir))
+
+    assert output == str(tmp_path / "print.zip")
+    assert not frame_dir.exists()
+    with zipfile.ZipFile(output) as archive:
+        assert archive.namelist() == ["000000.jpg", "000001.jpg", "000002.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_record_layers(hass: HomeAssistant, tmp_path):
+    """Test that a frame is captured per layer and assembled when the print ends."""
+    hass.config.media_dirs = {"local": str(tmp_path)}
+    entry = await init_integration(hass, skip_setup=True)
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_TIMELAPSE_MODE: TIMELAPSE_MODE_LAYER}
+    )
+    coordinator = MagicMock(config_entry=entry, last_update_success=True)
+    hub = MagicMock()
+    hub.async_get_frame = AsyncMock(return_value=JPEG_FRAME)
+    events = async_capture_events(hass, EVENT_TIMELAPSE_FINISHED)
+
+    recorder = TimelapseRecorder(hass, coordinator, hub)
+    recorder.async_start()
+    update_listener = coordinator.async_add_listener.call_args.args[0]
+    with (
+        patch(
+            "custom_components.flashforge.timelapse.ProcessPoolExecutor",
+            lambda **_: ThreadPoolExecutor(max_workers=1),
+        ),
+        patch("custom_components.flashforge.timelapse.shutil.which", return_value=None),
+    ):
+        for layer in ("1", "1", "2", "3"):
+            coordinator.data = replace(PRINTING, print_layer=layer)
+            update_listener()
+            await hass.async_block_till_done()
+
+        assert recorder.recording
+        frames = sorted(p.name for p in recorder.frame_dir.iterdir())
+        # First frame when the print starts, then one per new layer.
+        assert frames == ["000000.jpg", "000001.jpg", "000002.jpg"]
+
+        coordinator.data = replace(PRINTING, machine_status="READY")
+        update_listener()
+        await hass.async_block_till_done(wait_background_tasks=True)
+        await recorder.async_stop()
+
+    assert not recorder.recording
+    assert len(events) == 1
+    assert events[0].data["frames"] == 3
+    assert events[0].data["path"].endswith("-cube.zip")
+    assert hub.async_get_frame.await_count == 3